@@ -0,0 +1,194 @@
+"""
+Precomputed quadrature weights for integrating tabulated functions.
+
+Integration over a fixed grid is linear in the integrand, so Simpson's rule can be
+expressed as a vector of weights, and each integral becomes a single dot product (or,
+for many integrands sharing a grid, a single matrix-vector product). Weights for uniform
+grids are cached by the number of points.
+
+The handling of an even number of samples follows the options of
+:func:`scipy.integrate.simps` (before v1.11), but does not depend on the installed
+version of scipy.
+"""
+import functools
+import numpy as np
+
+_EVEN = ("avg", "first", "last", "simpson")
+
+
+def _simpson(h: np.ndarray) -> np.ndarray:
+    """Weights of the composite Simpson's rule for an odd number of samples.
+
+    Parameters
+    ----------
+    h : array_like
+        The (even number of) intervals between consecutive samples.
+    """
+    w = np.zeros(len(h) + 1)
+    h0 = h[0::2]
+    h1 = h[1::2]
+    hsum = h0 + h1
+    w[:-1:2] += hsum / 6 * (2 - h1 / h0)
+    w[1::2] += hsum ** 3 / (6 * h0 * h1)
+    w[2::2] += hsum / 6 * (2 - h0 / h1)
+    return w
+
+
+def _weights(h: np.ndarray, even: str) -> np.ndarray:
+    """Simpson weights for samples separated by intervals `h`."""
+    if even not in _EVEN:
+        raise ValueError(f"even must be one of {_EVEN}, got '{even}'")
+
+    n = len(h) + 1
+    if n == 1:
+        return np.zeros(1)
+    if n % 2:
+        return _simpson(h)
+    if n == 2:
+        return np.full(2, h[0] / 2)
+
+    w = np.zeros(n)
+    if even in ("avg", "first"):
+        # Simpson's rule for all but the last interval, trapezoid for the last.
+        wfirst = np.zeros(n)
+        wfirst[:-1] = _simpson(h[:-1])
+        wfirst[-2:] += h[-1] / 2
+        w += wfirst / (2 if even == "avg" else 1)
+    if even in ("avg", "last"):
+        # Trapezoid for the first interval, Simpson's rule for the rest.
+        wlast = np.zeros(n)
+        wlast[1:] = _simpson(h[1:])
+        wlast[:2] += h[0] / 2
+        w += wlast / (2 if even == "avg" else 1)
+    if even == "simpson":
+        # Simpson's rule for all but the last interval, which is integrated with the
+        # parabola through the last three points (Cartwright 2017).
+        w[:-1] = _simpson(h[:-1])
+        h0, h1 = h[-2], h[-1]
+        w[-1] += (2 * h1 ** 2 + 3 * h0 * h1) / (6 * (h0 + h1))
+        w[-2] += (h1 ** 2 + 3 * h0 * h1) / (6 * h0)
+        w[-3] -= h1 ** 3 / (6 * h0 * (h0 + h1))
+
+    return w
+
+
+@functools.lru_cache(maxsize=1024)
+def _unit_weights(n: int, even: str) -> np.ndarray:
+    w = _weights(np.ones(n - 1), even)
+    w.flags.writeable = False
+    return w
+
+
+def simpson_weights(n: int, dx: float = 1.0, even: str = "avg") -> np.ndarray:
+    """
+    Weights of Simpson's rule on a uniform grid.
+
+    Parameters
+    ----------
+    n : int
+        Number of samples.
+    dx : float, optional
+        Spacing of the samples.
+    even : {'avg', 'first', 'last', 'simpson'}, optional
+        How to treat an even number of samples (see :func:`scipy.integrate.simps`).
+
+    Returns
+    -------
+    w : array
+        The weights, such that ``y @ w`` is the integral of the samples ``y``.
+    """
+    return dx * _unit_weights(n, even)
+
+
+def simpson_weights_x(x: np.ndarray, even: str = "avg") -> np.ndarray:
+    """
+    Weights of Simpson's rule on an arbitrary grid.
+
+    Parameters
+    ----------
+    x : array_like
+        The (monotonic) sample points.
+    even : {'avg', 'first', 'last', 'simpson'}, optional
+        How to treat an even number of samples (see :func:`scipy.integrate.simps`).
+
+    Returns
+    -------
+    w : array
+        The weights, such that ``y @ w`` is the integral of the samples ``y``.
+    """
+    return _weights(np.diff(x), even)
+
+
+def cumulative_trapezoid(y, dx=1.0, x=None, initial=None):
+    """
+    Cumulatively integrate samples along their last axis with the trapezoid rule.
+
+    Equivalent to :func:`scipy.integrate.cumtrapz`.
+
+    Parameters
+    ----------
+    y : array_like
+        Samples to integrate.
+    dx : float, optional
+        Spacing of the samples, if `x` is not given.
+    x : array_like, optional
+        Sample points.
+    initial : float, optional
+        If given, prepended to the result, so that it has the same length as `y`.
+
+    Returns
+    -------
+    res : array
+        The cumulative integral.
+    """
+    y = np.asarray(y)
+    if x is not None:
+        dx = np.diff(x)
+    res = np.cumsum(dx * (y[..., 1:] + y[..., :-1]) / 2, axis=-1)
+
+    if initial is not None:
+        res = np.concatenate(
+            (np.full(y.shape[:-1] + (1,), initial, dtype=res.dtype), res), axis=-1
+        )
+    return res
+
+
+def cumulative_simpson(y, dx=1.0, initial=0.0):
+    """
+    Cumulatively integrate samples on a uniform grid along their last axis with
+    Simpson's rule.
+
+    Even-indexed points are integrated with the composite Simpson's rule, and each
+    odd-indexed point adds the integral of the parabola through its neighbours over
+    one interval.
+
+    Parameters
+    ----------
+    y : array_like
+        Samples to integrate (at least three along the last axis).
+    dx : float, optional
+        Spacing of the samples.
+    initial : float, optional
+        The value of the integral at the first sample.
+
+    Returns
+    -------
+    res : array
+        The cumulative integral, with the same shape as `y`.
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.shape[-1]
+    if n < 3:
+        raise ValueError("cumulative_simpson requires at least three samples")
+
+    y0, y1, y2 = y[..., 0:-2:2], y[..., 1:-1:2], y[..., 2::2]
+
+    res = np.empty_like(y)
+    res[..., 0] = initial
+    res[..., 2::2] = initial + np.cumsum(dx / 3 * (y0 + 4 * y1 + y2), axis=-1)
+    res[..., 1:-1:2] = res[..., 0:-2:2] + dx / 12 * (5 * y0 + 8 * y1 - y2)
+    if n % 2 == 0:
+        res[..., -1] = res[..., -2] + dx / 12 * (
+            -y[..., -3] + 8 * y[..., -2] + 5 * y[..., -1]
+        )
+    return res
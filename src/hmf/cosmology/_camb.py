@@ -0,0 +1,343 @@
+"""
+Shared CAMB calculations.
+
+Running CAMB is by far the most expensive part of most calculations, and the same run
+is needed by the CAMB transfer function and the CAMB growth factor. This module sets
+up ``CAMBparams`` consistently for an astropy cosmology, and memoizes the results of
+:func:`camb.get_transfer_functions` by the full set of parameters, so that each unique
+set of parameters is only run once.
+
+Optionally, the tables derived from a run (the transfer function and growth factor)
+may also be cached on disk, so that they are shared between processes. Cache files
+are named by a hash of the parameters, written atomically (so that concurrent
+writers are safe), and the least-recently used files are evicted when the total size
+of the cache exceeds a limit.
+"""
+import contextlib
+import hashlib
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+from astropy.cosmology import FLRW
+
+try:
+    import camb
+
+    HAVE_CAMB = True
+except ImportError:  # pragma: nocover
+    HAVE_CAMB = False
+
+# Results of CAMB runs, keyed by the repr of their CAMBparams.
+_CAMB_RESULTS = {}
+_MAX_CAMB_RESULTS = 8
+
+#: Attributes of ``CAMBparams`` that define a run, from
+#: https://camb.readthedocs.io/en/latest/model.html
+PARAMS_KEYS = [
+    "WantCls",
+    "WantTransfer",
+    "WantScalars",
+    "WantTensors",
+    "WantVectors",
+    "WantDerivedParameters",
+    "Want_cl_2D_array",
+    "Want_CMB",
+    "Want_CMB_lensing",
+    "DoLensing",
+    "NonLinear",
+    "Transfer",
+    "want_zstar",
+    "want_zdrag",
+    "min_l",
+    "max_l",
+    "max_l_tensor",
+    "max_eta_k",
+    "max_eta_k_tensor",
+    "ombh2",
+    "omch2",
+    "omk",
+    "omnuh2",
+    "H0",
+    "TCMB",
+    "YHe",
+    "num_nu_massless",
+    "num_nu_massive",
+    "nu_mass_eigenstates",
+    "share_delta_neff",
+    "InitPower",
+    "Recomb",
+    "Reion",
+    "DarkEnergy",
+    "NonLinearModel",
+    "Accuracy",
+    "SourceTerms",
+    "z_outputs",
+    "scalar_initial_condition",
+    "InitialConditionVector",
+    "OutputNormalization",
+    "Alens",
+    "MassiveNuMethod",
+    "DoLateRadTruncation",
+    "Evolve_baryon_cs",
+    "Evolve_delta_xe",
+    "Evolve_delta_Ts",
+    "Do21cm",
+    "transfer_21cm_cl",
+    "Log_lvalues",
+    "use_cl_spline_template",
+    "SourceWindows",
+]
+
+# Increment when the format of the disk cache changes.
+_CACHE_VERSION = 1
+
+#: Default maximum total size of the disk cache, in bytes.
+DEFAULT_CACHE_SIZE = 128 * 2 ** 20
+
+#: Scale factors at which the growth table is computed.
+GROWTH_LNA = np.linspace(np.log(1e-3), 0, 301)
+
+
+def default_params(kmax=None):
+    """
+    A new ``CAMBparams`` with the default settings used for the matter transfer
+    function (i.e. without any CMB calculations).
+
+    Parameters
+    ----------
+    kmax : float, optional
+        The maximum wavenumber of the transfer function. By default, CAMB's default.
+    """
+    params = camb.CAMBparams(
+        DoLensing=False,
+        Want_CMB=False,
+        Want_CMB_lensing=False,
+        WantCls=False,
+        WantDerivedParameters=False,
+    )
+
+    params.Transfer.high_precision = False
+    params.Transfer.k_per_logint = 0
+
+    if kmax:
+        params.Transfer.kmax = kmax
+
+    return params
+
+
+def set_cosmology(params, cosmo: FLRW):
+    """
+    Set the cosmology of ``CAMBparams`` from an astropy cosmology, in place.
+
+    Parameters
+    ----------
+    params : ``CAMBparams`` instance
+        The CAMB parameters to update.
+    cosmo : :class:`astropy.cosmology.FLRW` instance
+        The cosmology. It must have its baryon density and CMB temperature set.
+    """
+    if cosmo.Ob0 is None:
+        raise ValueError(
+            "To use CAMB, you must set the baryon density in the cosmology explicitly."
+        )
+
+    if cosmo.Tcmb0.value == 0:
+        raise ValueError(
+            "If using CAMB, the CMB temperature must be set explicitly in the cosmology."
+        )
+
+    params.set_cosmology(
+        H0=cosmo.H0.value,
+        ombh2=cosmo.Ob0 * cosmo.h ** 2,
+        omch2=(cosmo.Om0 - cosmo.Ob0 - cosmo.Onu0) * cosmo.h ** 2,
+        mnu=sum(cosmo.m_nu.value),
+        neutrino_hierarchy="degenerate",
+        omk=cosmo.Ok0,
+        nnu=cosmo.Neff,
+        standard_neutrino_neff=cosmo.Neff,
+        TCMB=cosmo.Tcmb0.value,
+    )
+    params.WantTransfer = True
+
+    # Set the DE equation of state. We only support constant w.
+    if hasattr(cosmo, "w0"):
+        params.set_dark_energy(w=cosmo.w0)
+
+    return params
+
+
+def get_results(params):
+    """
+    Get the results of :func:`camb.get_transfer_functions` for the given parameters.
+
+    Results are memoized by the full (canonical) representation of the parameters,
+    so that repeated calls with identical parameters -- even from different
+    ``CAMBparams`` instances -- only run CAMB once.
+
+    Parameters
+    ----------
+    params : ``CAMBparams`` instance
+        The CAMB parameters.
+
+    Returns
+    -------
+    ``CAMBdata`` instance
+        The CAMB results. These are shared, and should not be modified.
+    """
+    key = repr(params)
+    if key not in _CAMB_RESULTS:
+        _CAMB_RESULTS[key] = camb.get_transfer_functions(params)
+
+        while len(_CAMB_RESULTS) > _MAX_CAMB_RESULTS:
+            del _CAMB_RESULTS[next(iter(_CAMB_RESULTS))]
+
+    return _CAMB_RESULTS[key]
+
+
+def params_hash(params) -> str:
+    """
+    A canonical hash of the fields of ``CAMBparams`` (see :data:`PARAMS_KEYS`), and
+    the version of CAMB.
+    """
+    state = [f"camb={camb.__version__}", f"cache={_CACHE_VERSION}"]
+    for key in PARAMS_KEYS:
+        if hasattr(params, key):
+            state.append(f"{key}={getattr(params, key)!r}")
+
+    return hashlib.sha256("\n".join(state).encode()).hexdigest()
+
+
+def load_cached(cache_dir: str, name: str):
+    """
+    Load the arrays of an entry in the disk cache.
+
+    Returns
+    -------
+    dict or None
+        The arrays, or None if the entry does not exist (or is unreadable).
+    """
+    path = os.path.join(cache_dir, name + ".npz")
+    try:
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+        return None
+
+    # Mark the entry as recently used, for eviction.
+    with contextlib.suppress(OSError):
+        os.utime(path)
+
+    return arrays
+
+
+def save_cached(cache_dir: str, name: str, max_size=DEFAULT_CACHE_SIZE, **arrays):
+    """
+    Atomically save arrays as an entry in the disk cache, and evict the
+    least-recently used entries if the cache is larger than `max_size` bytes.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Write to a temporary file and rename it, so that readers (and other writers of
+    # the same entry) never see a partially written file.
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".tmp-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as fl:
+            np.savez(fl, **arrays)
+        os.replace(tmp, os.path.join(cache_dir, name + ".npz"))
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+    _evict(cache_dir, max_size)
+
+
+def _evict(cache_dir, max_size):
+    """Remove the least-recently used entries until the cache fits in `max_size`."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".npz") and not entry.name.startswith("."):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        total -= size
+
+
+def _cached_table(kind, compute, params, cache_dir, max_cache_size):
+    """Get the table computed by ``compute(params)``, from the disk cache if given."""
+    if cache_dir is None:
+        return compute(params)
+
+    name = f"{params_hash(params)}-{kind}"
+    arrays = load_cached(cache_dir, name)
+    if arrays is None:
+        arrays = compute(params)
+        save_cached(cache_dir, name, max_cache_size, **arrays)
+    return arrays
+
+
+def _transfer_table(params):
+    transfer = get_results(params).get_matter_transfer_data().transfer_data
+    return {"lnk": np.log(transfer[0, :, 0]), "lnt": np.log(transfer[6, :, 0])}
+
+
+def _growth_table(params):
+    z = np.exp(-GROWTH_LNA) - 1
+    delta = get_results(params).get_redshift_evolution(1.0, z, ["delta_tot"])
+    return {"lna": GROWTH_LNA, "lndelta": np.log(delta.flatten())}
+
+
+def transfer_table(params, cache_dir=None, max_cache_size=DEFAULT_CACHE_SIZE):
+    """
+    The (un-normalised) total matter transfer function of a CAMB run.
+
+    Parameters
+    ----------
+    params : ``CAMBparams`` instance
+        The CAMB parameters.
+    cache_dir : str, optional
+        A directory in which to cache the table on disk.
+    max_cache_size : int, optional
+        The maximum total size of the disk cache, in bytes.
+
+    Returns
+    -------
+    dict
+        With arrays ``lnk`` (log wavenumber, [h/Mpc]) and ``lnt`` (log transfer).
+    """
+    return _cached_table(
+        "transfer", _transfer_table, params, cache_dir, max_cache_size
+    )
+
+
+def growth_table(params, cache_dir=None, max_cache_size=DEFAULT_CACHE_SIZE):
+    """
+    The (un-normalised) total matter perturbation at k=1/Mpc of a CAMB run, as a
+    function of scale factor (see :data:`GROWTH_LNA`).
+
+    Parameters
+    ----------
+    params : ``CAMBparams`` instance
+        The CAMB parameters.
+    cache_dir : str, optional
+        A directory in which to cache the table on disk.
+    max_cache_size : int, optional
+        The maximum total size of the disk cache, in bytes.
+
+    Returns
+    -------
+    dict
+        With arrays ``lna`` (log scale factor) and ``lndelta`` (log perturbation).
+    """
+    return _cached_table("growth", _growth_table, params, cache_dir, max_cache_size)
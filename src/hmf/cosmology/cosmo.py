@@ -15,9 +15,21 @@ from astropy.cosmology import FLRW, Planck15, WMAP5, WMAP7, WMAP9, Planck13  # n
 from astropy import cosmology as acsm
 from .._internals import _framework, _cache
 from .. import __version__
+import math
 import sys
+import weakref
+import numpy as np
 import astropy.units as u
 import deprecation
+from scipy.interpolate import CubicSpline
+
+# Tabulated cosmologies, shared between all users of the same cosmology.
+_FAST_COSMOLOGIES = {}
+_MAX_FAST_COSMOLOGIES = 32
+
+# The same, keyed by the id of the (immutable) astropy cosmology, with a weak
+# reference to it to guard against re-use of the id.
+_FAST_COSMOLOGIES_BY_ID = {}
 
 
 @deprecation.deprecated(
@@ -38,6 +50,190 @@ def astropy_to_colossus(cosmo: FLRW, name: str = "custom", **kwargs):
         )
 
 
+def _cosmo_key(cosmo):
+    """
+    A hashable key of the parameters of an astropy cosmology, which determine
+    :math:`E(z)` and therefore the growth of structure.
+
+    The key consists of the type of the cosmology and the values of all of its
+    astropy ``Parameter``s (including any defined on custom subclasses). For old
+    versions of astropy without ``__parameters__``, the cosmology itself is used.
+    """
+    names = getattr(type(cosmo), "__parameters__", None)
+    if names is None:  # pragma: nocover
+        return cosmo
+
+    key = [type(cosmo)]
+    for name in names:
+        val = getattr(cosmo, name)
+        if val is not None:
+            val = tuple(np.atleast_1d(getattr(val, "value", val)).tolist())
+        key.append((name, val))
+    return tuple(key)
+
+
+class _UniformSpline:
+    """
+    A cubic spline of ``f(ln(1+z))`` on a uniform grid, evaluated directly from its
+    coefficients (in pure python for scalars), with low per-call overhead.
+
+    Outside the grid, the function `exact` (of redshift) is evaluated instead.
+    """
+
+    def __init__(self, x, y, exact):
+        self.x0 = x[0]
+        self.dx = x[1] - x[0]
+        self.n = len(x) - 1
+        self.exact = exact
+
+        # Polynomial coefficients of each interval, highest order first.
+        self.coeffs = CubicSpline(x, y).c.T.copy()
+        self._coeff_list = self.coeffs.tolist()
+
+    def __call__(self, z):
+        if np.ndim(z) == 0:
+            u = (math.log1p(z) - self.x0) / self.dx
+            if not 0 <= u <= self.n:
+                return float(self.exact(z))
+            i = min(int(u), self.n - 1)
+            t = (u - i) * self.dx
+            c0, c1, c2, c3 = self._coeff_list[i]
+            return ((c0 * t + c1) * t + c2) * t + c3
+
+        z = np.asarray(z, dtype=float)
+        u = (np.log1p(z) - self.x0) / self.dx
+        i = np.clip(u.astype(int), 0, self.n - 1)
+        t = (u - i) * self.dx
+        c = self.coeffs[i]
+        out = ((c[..., 0] * t + c[..., 1]) * t + c[..., 2]) * t + c[..., 3]
+
+        outside = (u < 0) | (u > self.n)
+        if np.any(outside):
+            out[outside] = self.exact(z[outside])
+        return out
+
+
+class FastCosmology:
+    r"""
+    Unitless, vectorized background quantities of an astropy cosmology.
+
+    The astropy cosmology methods carry a large per-call overhead (from units and
+    input validation) compared to the calculation itself, which dominates when they
+    are called with scalars or small arrays in hot paths. This class tabulates
+    :math:`\ln E(z)`, the dark energy density scaling and :math:`w(z)` once, on a
+    regular grid in :math:`\ln(1+z)`, and interpolates them with cubic splines
+    (to a relative accuracy of ~1e-10). Redshifts outside the table fall back to the
+    astropy cosmology.
+
+    Use :func:`fast_cosmology` to get an instance shared by all users of the same
+    cosmology.
+
+    Parameters
+    ----------
+    cosmo : :class:`astropy.cosmology.FLRW` instance
+        The cosmology to tabulate.
+    zmax : float, optional
+        The maximum redshift of the table.
+    dlnz : float, optional
+        The step size of the table, in :math:`\ln(1+z)`.
+    """
+
+    def __init__(self, cosmo: FLRW, zmax: float = 1e9, dlnz: float = 0.005):
+        self.cosmo = cosmo
+
+        xmin, xmax = np.log(0.5), np.log1p(zmax)
+        x = np.linspace(xmin, xmax, int(np.ceil((xmax - xmin) / dlnz)) + 1)
+        z = np.expm1(x)
+
+        def _lnefunc(z):
+            return np.log(cosmo.efunc(z))
+
+        def _lnde_scale(z):
+            return np.log(cosmo.de_density_scale(z))
+
+        def _w(z):
+            return cosmo.w(z) * np.ones_like(z)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            lnefunc, lnde_scale, w = _lnefunc(z), _lnde_scale(z), _w(z)
+
+        # Unphysical cosmologies may have no valid E(z) at some redshifts, so only
+        # tabulate the (finite) range around z=0.
+        bad = np.flatnonzero(
+            ~(np.isfinite(lnefunc) & np.isfinite(lnde_scale) & np.isfinite(w))
+        )
+        i0 = np.searchsorted(x, 0)
+        lo = bad[bad < i0].max() + 1 if np.any(bad < i0) else 0
+        hi = bad[bad >= i0].min() if np.any(bad >= i0) else len(x)
+        x = x[lo:hi]
+
+        self._lnefunc = _UniformSpline(x, lnefunc[lo:hi], _lnefunc)
+        self._lnde_scale = _UniformSpline(x, lnde_scale[lo:hi], _lnde_scale)
+        self._w = _UniformSpline(x, w[lo:hi], _w)
+
+        #: Critical density at z=0 [h^2 Msun/Mpc^3]
+        self.critical_density0 = (
+            (cosmo.critical_density0 / cosmo.h ** 2).to(u.Msun / u.Mpc ** 3).value
+        )
+        #: Mean matter density at z=0 [h^2 Msun/Mpc^3]
+        self.mean_density0 = cosmo.Om0 * self.critical_density0
+
+    def efunc(self, z):
+        """Dimensionless Hubble parameter, :math:`E(z) = H(z)/H_0`."""
+        return np.exp(self._lnefunc(z))
+
+    def de_density_scale(self, z):
+        """Evolution of the dark energy density relative to z=0."""
+        return np.exp(self._lnde_scale(z))
+
+    def w(self, z):
+        """Dark energy equation of state."""
+        return self._w(z)
+
+    def Om(self, z):
+        """Non-relativistic matter density parameter at redshift `z`."""
+        return self.cosmo.Om0 * (1 + np.asarray(z)) ** 3 / self.efunc(z) ** 2
+
+    def Ode(self, z):
+        """Dark energy density parameter at redshift `z`."""
+        return self.cosmo.Ode0 * self.de_density_scale(z) / self.efunc(z) ** 2
+
+    def critical_density(self, z):
+        """Critical density at redshift `z` [h^2 Msun/Mpc^3]."""
+        return self.critical_density0 * self.efunc(z) ** 2
+
+    def mean_density(self, z):
+        """Mean matter density at redshift `z` [h^2 Msun/Mpc^3]."""
+        return self.mean_density0 * (1 + np.asarray(z)) ** 3
+
+
+def fast_cosmology(cosmo: FLRW) -> FastCosmology:
+    """
+    Get the (shared) :class:`FastCosmology` of an astropy cosmology.
+
+    Instances are cached at the module level, keyed by the cosmological parameters,
+    so that the tables are only built once per cosmology. The lookup is memoized by
+    the identity of `cosmo`, so that repeated calls for the same object are cheap.
+    """
+    ref, fast = _FAST_COSMOLOGIES_BY_ID.get(id(cosmo), (None, None))
+    if ref is not None and ref() is cosmo:
+        return fast
+
+    key = _cosmo_key(cosmo)
+    if key not in _FAST_COSMOLOGIES:
+        _FAST_COSMOLOGIES[key] = FastCosmology(cosmo)
+
+        while len(_FAST_COSMOLOGIES) > _MAX_FAST_COSMOLOGIES:
+            del _FAST_COSMOLOGIES[next(iter(_FAST_COSMOLOGIES))]
+
+    fast = _FAST_COSMOLOGIES[key]
+    _FAST_COSMOLOGIES_BY_ID[id(cosmo)] = (weakref.ref(cosmo), fast)
+    while len(_FAST_COSMOLOGIES_BY_ID) > _MAX_FAST_COSMOLOGIES:
+        del _FAST_COSMOLOGIES_BY_ID[next(iter(_FAST_COSMOLOGIES_BY_ID))]
+
+    return fast
+
+
 class Cosmology(_framework.Framework):
     """
     Basic Cosmology object.
@@ -116,6 +312,14 @@ class Cosmology(_framework.Framework):
         """
         return self.cosmo_model.clone(**self.cosmo_params)
 
+    @_cache.cached_quantity
+    def fast_cosmo(self):
+        """
+        Tabulated, unitless background quantities of :attr:`cosmo`
+        (:class:`FastCosmology`), for efficient internal use.
+        """
+        return fast_cosmology(self.cosmo)
+
     @_cache.cached_quantity
     def mean_density0(self):
         """
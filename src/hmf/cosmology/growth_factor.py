@@ -8,10 +8,13 @@ may be implemented.
 """
 
 import numpy as np
-from scipy import integrate as intg
+from .._internals import _quadrature
 from .._internals._framework import Component as Cmpt, pluggable
 from scipy.interpolate import InterpolatedUnivariateSpline as _spline
+from scipy.integrate import quad, solve_ivp
 from .._internals._utils import inherit_docstrings as _inherit
+from .cosmo import _cosmo_key, fast_cosmology
+from . import _camb
 import warnings
 
 try:
@@ -22,6 +25,11 @@ except ImportError:
     HAVE_CAMB = False
 
 
+# Tables of the growth integral, shared between instances with the same cosmology.
+_GROWTH_TABLES = {}
+_MAX_GROWTH_TABLES = 32
+
+
 @pluggable
 class _GrowthFactor(Cmpt):
     r"""
@@ -31,6 +39,53 @@ class _GrowthFactor(Cmpt):
     def __init__(self, cosmo, **model_parameters):
         self.cosmo = cosmo
         super(_GrowthFactor, self).__init__(**model_parameters)
+        self._growth_table = None
+        self._fast_cosmo = None
+
+    @property
+    def fast_cosmo(self):
+        """Tabulated background quantities of :attr:`cosmo`, for internal use."""
+        if self._fast_cosmo is None:
+            self._fast_cosmo = fast_cosmology(self.cosmo)
+        return self._fast_cosmo
+
+    def _cached_table(self, build):
+        """
+        Get the table shared by all instances of this class with the same cosmology
+        and parameters, calling ``build()`` to create it if it is not yet cached.
+        """
+        if self._growth_table is None:
+            key = (
+                type(self),
+                _cosmo_key(self.cosmo),
+                tuple(sorted(self.params.items())),
+            )
+            if key not in _GROWTH_TABLES:
+                _GROWTH_TABLES[key] = build()
+
+                while len(_GROWTH_TABLES) > _MAX_GROWTH_TABLES:
+                    del _GROWTH_TABLES[next(iter(_GROWTH_TABLES))]
+
+            self._growth_table = _GROWTH_TABLES[key]
+        return self._growth_table
+
+    def growth_factor_and_rate(self, z):
+        r"""
+        Calculate both the growth factor and growth rate, :math:`d\ln d/d\ln a`.
+
+        Models may override this to calculate both from a single evaluation.
+
+        Parameters
+        ----------
+        z : array_like
+            The redshift.
+
+        Returns
+        -------
+        growth_factor, growth_rate : array_like
+            The normalised growth factor and the growth rate at `z`.
+        """
+        return self.growth_factor(z), self.growth_rate(z)
 
 
 class GrowthFactor(_GrowthFactor):
@@ -48,7 +103,13 @@ class GrowthFactor(_GrowthFactor):
 
         :dlna: Step-size in log-space for scale-factor integration
         :amin: Minimum scale-factor (i.e.e maximum redshift) to integrate to.
-               Only used for :meth:`growth_factor_fn`.
+
+    Notes
+    -----
+    The growth integral is computed once, cumulatively over the whole range of scale
+    factor, and interpolated, so that :meth:`growth_factor` accepts arrays of
+    redshift at the cost of a single evaluation. The table is cached at the module
+    level, and shared by all instances with the same cosmological parameters.
 
     References
     ----------
@@ -64,13 +125,84 @@ class GrowthFactor(_GrowthFactor):
                 "Using this growth factor model in wCDM can lead to inaccuracy. Try using CambGrowth."
             )
 
+    def _table(self):
+        r"""
+        The (shared) table of the growth integral, and functions derived from it, for
+        this cosmology.
+
+        The integral is tabulated cumulatively (with Simpson's rule) from
+        :math:`a_{\rm min}` to :math:`a=1`, and interpolated in log space, in which it
+        is close to linear.
+        """
+        return self._cached_table(self._build_table)
+
+    def _integrand(self, lna):
+        """The integrand of the growth integral, with respect to ln(a)."""
+        a = np.exp(lna)
+        return a / (a * self.fast_cosmo.efunc(1 / a - 1)) ** 3
+
+    def _build_table(self):
+        lnamin = np.log(self.params["amin"])
+        n = int(np.ceil(-lnamin / self.params["dlna"])) + 1
+        lna_grid = np.linspace(lnamin, 0, n)
+        integrand = self._integrand(lna_grid)
+
+        # Below amin, the integrand is a power-law in a, which sets the integral
+        # up to amin.
+        dlna = lna_grid[1] - lna_grid[0]
+        slope = np.log(integrand[1] / integrand[0]) / dlna
+        integral = _quadrature.cumulative_simpson(
+            integrand, dx=dlna, initial=integrand[0] / slope
+        )
+        return {
+            "lnintegral": _spline(lna_grid, np.log(integral)),
+            "lnamin": lnamin,
+            "slope": slope,
+            "integral": integral[[0, -1]],
+        }
+
+    def _integral(self, lna):
+        r"""
+        The growth integral :math:`\int_0^a da'/(a' E(a'))^3` at ``exp(lna)``.
+
+        Outside the table (ie. for negative redshift, or scale factors below amin),
+        it is not extrapolated, but integrated directly from the end of the table.
+        """
+        table = self._table()
+        lna = np.asarray(lna, dtype=float)
+        out = np.exp(table["lnintegral"](np.clip(lna, table["lnamin"], 0)))
+
+        below = lna < table["lnamin"]
+        if np.any(below):
+            out = np.where(
+                below,
+                table["integral"][0]
+                * np.exp(table["slope"] * (lna - table["lnamin"])),
+                out,
+            )
+
+        above = lna > 0
+        if np.any(above):
+            extra = [quad(self._integrand, 0, x)[0] for x in lna[above]]
+            out = np.array(out, dtype=float)
+            out[above] = table["integral"][-1] + np.array(extra)
+        return out
+
+    def _lna_vec(self, z):
+        """Vector of ln(a), in steps of dlna from amin up to the scale factor at `z`."""
+        a_upper = 1.0 / (1.0 + z)
+        lna = np.arange(
+            np.log(self.params["amin"]), np.log(a_upper), self.params["dlna"]
+        )
+        return np.hstack((lna, np.log(a_upper)))
+
     def _d_plus(self, z, getvec=False):
         r"""
         Finds the factor :math:`D^+(a)`, from Lukic et. al. 2007, eq. 8.
 
         Parameters
         ----------
-        z : float
+        z : array_like
             The redshift
         getvec : bool, optional
             Whether to treat `z` as a maximum redshift and return a whole vector
@@ -80,29 +212,19 @@ class GrowthFactor(_GrowthFactor):
 
         Returns
         -------
-        dplus : float
+        dplus : array_like
             The un-normalised growth factor.
         """
+        if getvec:
+            z = 1.0 / np.exp(self._lna_vec(z)) - 1.0
 
-        a_upper = 1.0 / (1.0 + z)
-
-        lna = np.arange(
-            np.log(self.params["amin"]), np.log(a_upper), self.params["dlna"]
+        return (
+            5.0
+            * self.cosmo.Om0
+            * self.fast_cosmo.efunc(z)
+            * self._integral(-np.log1p(z))
+            / 2.0
         )
-        lna = np.hstack((lna, np.log(a_upper)))
-
-        self._zvec = 1.0 / np.exp(lna) - 1.0
-
-        integrand = 1.0 / (np.exp(lna) * self.cosmo.efunc(self._zvec)) ** 3
-
-        if not getvec:
-            integral = intg.simps(np.exp(lna) * integrand, x=lna, even="avg")
-            dplus = 5.0 * self.cosmo.Om0 * self.cosmo.efunc(z) * integral / 2.0
-        else:
-            integral = intg.cumtrapz(np.exp(lna) * integrand, x=lna, initial=0.0)
-            dplus = 5.0 * self.cosmo.Om0 * self.cosmo.efunc(self._zvec) * integral / 2.0
-
-        return dplus
 
     def growth_factor(self, z):
         r"""
@@ -110,15 +232,18 @@ class GrowthFactor(_GrowthFactor):
 
         Parameters
         ----------
-        z : float
+        z : array_like
             The redshift
 
         Returns
         -------
-        float
+        array_like
             The normalised growth factor.
         """
-        return self._d_plus(z) / self._d_plus(0.0)
+        table = self._table()
+        if "dplus0" not in table:
+            table["dplus0"] = self._d_plus(0.0)
+        return self._d_plus(z) / table["dplus0"]
 
     def growth_factor_fn(self, zmin=0.0, inverse=False):
         """
@@ -139,29 +264,59 @@ class GrowthFactor(_GrowthFactor):
             The normalised growth factor as a function of redshift, or
             redshift as a function of growth factor if ``inverse`` is True.
         """
-        dp = self._d_plus(0.0, True)
-        growth = dp / dp[-1]
-        if not inverse:
-            s = _spline(self._zvec[::-1], growth[::-1])
-        else:
-            s = _spline(growth, self._zvec)
-        return s
+        table = self._table()
+        if "growth_fn" not in table:
+            zvec = 1.0 / np.exp(self._lna_vec(0.0)) - 1.0
+            growth = self.growth_factor(zvec)
+            table["growth_fn"] = _spline(zvec[::-1], growth[::-1])
+            table["inverse_growth_fn"] = _spline(growth, zvec)
+
+        return table["inverse_growth_fn" if inverse else "growth_fn"]
+
+    def growth_factor_and_rate(self, z):
+        r"""
+        Calculate both the growth factor and growth rate, :math:`d\ln d/d\ln a`.
+
+        The growth rate is the exact logarithmic derivative of :math:`D^+` (eq. 8 of
+        Lukic et. al. 2007), evaluated from the same growth integral.
+
+        Parameters
+        ----------
+        z : array_like
+            The redshift.
+
+        Returns
+        -------
+        growth_factor, growth_rate : array_like
+            The normalised growth factor and the growth rate at `z`.
+        """
+        table = self._table()
+        if "dplus0" not in table:
+            table["dplus0"] = self._d_plus(0.0)
+
+        lna = -np.log1p(z)
+        efunc = self.fast_cosmo.efunc(z)
+        integral = self._integral(lna)
+
+        h = 1e-4
+        dlnefunc = (
+            np.log(self.fast_cosmo.efunc(np.exp(-lna - h) - 1))
+            - np.log(self.fast_cosmo.efunc(np.exp(-lna + h) - 1))
+        ) / (2 * h)
+        rate = dlnefunc + 1 / (np.exp(2 * lna) * efunc ** 3 * integral)
+
+        return 2.5 * self.cosmo.Om0 * efunc * integral / table["dplus0"], rate
 
     def growth_rate(self, z):
         """
-        Growth rate, dln(d)/dln(a) from Hamilton 2000 eq. 4
+        Growth rate, dln(d)/dln(a).
 
         Parameters
         ----------
-        z : float
+        z : array_like
             The redshift
         """
-        return (
-            -1
-            - self.cosmo.Om(z) / 2
-            + self.cosmo.Ode(z)
-            + 5 * self.cosmo.Om(z) / (2 * self.growth_factor(z))
-        )
+        return self.growth_factor_and_rate(z)[1]
 
     def growth_rate_fn(self, zmin=0):
         """
@@ -177,14 +332,7 @@ class GrowthFactor(_GrowthFactor):
         callable
             The normalised growth rate as a function of redshift.
         """
-        gfn = self.growth_factor_fn(zmin)
-
-        return lambda z: (
-            -1
-            - self.cosmo.Om(z) / 2
-            + self.cosmo.Ode(z)
-            + 5 * self.cosmo.Om(z) / (2 * gfn(z))
-        )
+        return self.growth_rate
 
 
 @_inherit
@@ -209,10 +357,40 @@ class GenMFGrowth(GrowthFactor):
 
     def _d_plus(self, z, getvec=False):
         """
-        This is not implemented in this class. It is not
-        required to calculate :meth:`growth_factor`.
+        The un-normalised growth factor, which tends to `a` at early times (taken to
+        be `zmax`). Note that the `getvec` argument is not used in this function.
+        """
+        zmax = self.params["zmax"]
+        return self.growth_factor(z) / ((1 + zmax) * self.growth_factor(zmax))
+
+    def growth_factor_and_rate(self, z):
+        r"""
+        Calculate both the growth factor and growth rate, :math:`d\ln d/d\ln a`.
+
+        The growth rate follows Hamilton 2000 eq. 4, for the same matter and
+        cosmological-constant cosmology as :meth:`growth_factor`.
+
+        Parameters
+        ----------
+        z : array_like
+            The redshift.
+
+        Returns
+        -------
+        growth_factor, growth_rate : array_like
+            The normalised growth factor and the growth rate at `z`.
         """
-        raise NotImplementedError()
+        z = np.asarray(z)
+        dplus = self._d_plus(z)
+        zmax = self.params["zmax"]
+        growth = dplus * (1 + zmax) * self.growth_factor(zmax)
+
+        om = self.cosmo.Om0 * (1 + z) ** 3
+        e2 = om + (1 - self.cosmo.Om0 - self.cosmo.Ode0) * (1 + z) ** 2
+        e2 = e2 + self.cosmo.Ode0
+        om = om / e2
+        ode = self.cosmo.Ode0 / e2
+        return growth, -1 - om / 2 + ode + 5 * om / (2 * (1 + z) * dplus)
 
     def _general_case(self, w, x):
         x = np.atleast_1d(x)
@@ -220,7 +398,9 @@ class GenMFGrowth(GrowthFactor):
 
         func = _spline(xn_vec, (xn_vec / (xn_vec ** 3 + 2)) ** 1.5)
 
-        g = np.array([func.integral(0, y) for y in x])
+        # Evaluate the integral from 0 to every x at once.
+        antiderivative = func.antiderivative()
+        g = antiderivative(x) - antiderivative(0)
         return ((x ** 3.0 + 2.0) ** 0.5) * (g / x ** 1.5)
 
     def growth_factor(self, z):
@@ -291,9 +471,9 @@ class GenMFGrowth(GrowthFactor):
         if not inverse:
             return self.growth_factor
         else:
-            self._zvec = np.arange(zmin, self.params["zmax"], self.params["dz"])
-            gf = self.growth_factor(self._zvec)
-            return _spline(gf[::-1], self._zvec[::-1])
+            zvec = np.arange(zmin, self.params["zmax"], self.params["dz"])
+            gf = self.growth_factor(zvec)
+            return _spline(gf[::-1], zvec[::-1])
 
 
 @_inherit
@@ -318,6 +498,12 @@ class Carroll1992(GrowthFactor):
 
     _defaults = {"dz": 0.01, "zmax": 1000.0}
 
+    def _omegas(self, z):
+        """The matter and dark energy density parameters used by the approximation."""
+        om = self.cosmo.Om0 * (1 + z) ** 3
+        denom = self.cosmo.Ode0 + om
+        return om / denom, self.cosmo.Ode0 / denom
+
     def _d_plus(self, z, getvec=False):
         """
         Calculate un-normalised growth factor as a function
@@ -326,15 +512,35 @@ class Carroll1992(GrowthFactor):
         """
         a = 1 / (1 + z)
 
-        om = self.cosmo.Om0 / a ** 3
-        denom = self.cosmo.Ode0 + om
-        Omega_m = om / denom
-        Omega_L = self.cosmo.Ode0 / denom
+        Omega_m, Omega_L = self._omegas(z)
         coeff = 5.0 * Omega_m / (2.0 / a)
         term1 = Omega_m ** (4.0 / 7.0)
         term3 = (1.0 + 0.5 * Omega_m) * (1.0 + Omega_L / 70.0)
         return coeff / (term1 - Omega_L + term3)
 
+    def growth_factor_and_rate(self, z):
+        r"""
+        Calculate both the growth factor and growth rate, :math:`d\ln d/d\ln a`.
+
+        The growth rate follows Hamilton 2000 eq. 4, using the approximate
+        :math:`D^+` of this model.
+
+        Parameters
+        ----------
+        z : array_like
+            The redshift.
+
+        Returns
+        -------
+        growth_factor, growth_rate : array_like
+            The normalised growth factor and the growth rate at `z`.
+        """
+        z = np.asarray(z)
+        dplus = self._d_plus(z)
+        om, ode = self._omegas(z)
+        rate = -1 - om / 2 + ode + 5 * om / (2 * (1 + z) * dplus)
+        return dplus / self._d_plus(0.0), rate
+
     def growth_factor(self, z):
         """
         The growth factor, :math:`d(a) = D^+(a)/D^+(a=1)`.
@@ -373,60 +579,219 @@ class Carroll1992(GrowthFactor):
         if not inverse:
             return self.growth_factor
         else:
-            self._zvec = np.arange(zmin, self.params["zmax"], self.params["dz"])
-            gf = self.growth_factor(self._zvec)
-            return _spline(gf[::-1], self._zvec[::-1])
+            zvec = np.arange(zmin, self.params["zmax"], self.params["dz"])
+            gf = self.growth_factor(zvec)
+            return _spline(gf[::-1], zvec[::-1])
+
+
+@_inherit
+class ODEGrowth(_GrowthFactor):
+    r"""
+    Growth factor and rate from a numerical solution of the linear growth equation.
+
+    The equation
+
+    .. math:: \frac{d^2 D}{d\ln a^2} + \left(2 + \frac{d\ln E}{d\ln a}\right)
+              \frac{dD}{d\ln a} - \frac{3}{2}\Omega_m(a) D = 0
+
+    is solved once, from :math:`a_{\rm min}` to :math:`a=1`, for any ``astropy``
+    FLRW cosmology (including time-varying dark energy, e.g. ``w0waCDM``), starting
+    from the growing mode of a matter+radiation universe. The growth factor and
+    growth rate are interpolated from the solution, which is cached for each
+    cosmology.
+
+    Parameters
+    ----------
+    cosmo : ``astropy.cosmology.FLRW`` instance
+        Cosmological model.
+    \*\*model_parameters : unpack-dict
+        Parameters specific to this model. In this case, available
+        parameters are as follows.To see their default values, check
+        the :attr:`_defaults` class attribute.
+
+        :dlna: Step-size in log-space of scale-factor of the output table.
+        :amin: Minimum scale-factor (i.e. maximum redshift) of the solution.
+        :rtol: Relative tolerance of the ODE solver.
+    """
+
+    _defaults = {"dlna": 0.01, "amin": 1e-5, "rtol": 1e-8}
+
+    def _table(self):
+        """The (shared) solution of the growth equation for this cosmology."""
+        return self._cached_table(self._build_table)
+
+    def _build_table(self):
+        lnamin = np.log(self.params["amin"])
+        n = int(np.ceil(-lnamin / self.params["dlna"])) + 1
+        lna = np.linspace(lnamin, 0, n)
+        z = np.exp(-lna) - 1
+
+        # Splines of the background, so the solver does not call astropy.
+        dlnE = _spline(lna, np.log(self.fast_cosmo.efunc(z))).derivative()
+        om = _spline(lna, self.fast_cosmo.Om(z))
+
+        def rhs(x, y):
+            return [y[1], -(2 + dlnE(x)) * y[1] + 1.5 * om(x) * y[0]]
+
+        # Growing mode in matter+radiation (Meszaros), D ~ a_eq + 3a/2, where
+        # everything still relativistic at amin counts as radiation.
+        a0 = self.params["amin"]
+        # Onu(z) is relative to the critical density at z, so scale it to today.
+        onu = self.cosmo.Onu(z[0]) * self.cosmo.efunc(z[0]) ** 2 * a0 ** 4
+        a_eq = (self.cosmo.Ogamma0 + onu) / self.cosmo.Om0
+        y0 = [a_eq + 1.5 * a0, 1.5 * a0]
+
+        sol = solve_ivp(
+            rhs,
+            (lna[0], lna[-1]),
+            y0,
+            method="DOP853",
+            t_eval=lna,
+            rtol=self.params["rtol"],
+            atol=0,
+        )
+        d, dd = sol.y
+        lngrowth = np.log(d / d[-1])
+        rate = dd / d
+
+        return {
+            "lna": lna,
+            "lngrowth": _spline(lna, lngrowth),
+            "rate": _spline(lna, rate),
+            "growth_fn": _spline(z[::-1], np.exp(lngrowth[::-1])),
+            "inverse_growth_fn": _spline(np.exp(lngrowth), z),
+            "rate_fn": _spline(z[::-1], rate[::-1]),
+        }
+
+    def growth_factor(self, z):
+        r"""
+        The growth factor, :math:`d(a) = D^+(a)/D^+(a=1)`.
+
+        Parameters
+        ----------
+        z : array_like
+            Redshift.
+
+        Returns
+        -------
+        gf : array_like
+            The growth factor at `z`.
+        """
+        return np.exp(self._table()["lngrowth"](-np.log1p(z)))
+
+    def growth_factor_fn(self, zmin=0.0, inverse=False):
+        """
+        Return the growth factor as a callable function.
+
+        Parameters
+        ----------
+        zmin : float, optional
+            The minimum redshift of the function. Default 0.0
+        inverse: bool, optional
+            Whether to return the inverse relationship [z(g)]. Default False.
+
+        Returns
+        -------
+        callable
+            The normalised growth factor as a function of redshift, or
+            redshift as a function of growth factor if ``inverse`` is True.
+        """
+        return self._table()["inverse_growth_fn" if inverse else "growth_fn"]
+
+    def growth_rate(self, z):
+        r"""
+        Growth rate, :math:`d\ln d/d\ln a`.
+
+        Parameters
+        ----------
+        z : array_like
+            The redshift
+        """
+        return self._table()["rate"](-np.log1p(z))
+
+    def growth_rate_fn(self, zmin=0):
+        r"""
+        Growth rate, :math:`d\ln d/d\ln a`, as callable.
+
+        Parameters
+        ----------
+        zmin : float, optional
+            The minimum redshift of the function. Default 0.0
+
+        Returns
+        -------
+        callable
+            The growth rate as a function of redshift.
+        """
+        return self._table()["rate_fn"]
 
 
 if HAVE_CAMB:
 
     @_inherit
     class CambGrowth(_GrowthFactor):
-        """
+        r"""
         Uses CAMB to generate the growth factor, at k/h = 1.0. This class is recommended
         if the cosmology is not LambdaCDM (but instead wCDM), as it correctly deals with
         the growth in this case. However, it standard LCDM is used, other classes are
         preferred, as this class needs to re-calculate the transfer function.
+
+        Parameters
+        ----------
+        cosmo : ``astropy.cosmology.FLRW`` instance
+            Cosmological model.
+        \*\*model_parameters : unpack-dict
+            Parameters specific to this model. In this case, available
+            parameters are as follows.To see their default values, check
+            the :attr:`_defaults` class attribute.
+
+            :camb_params: An instantiated ``CAMBparams`` object, pre-set with desired
+                          accuracy options etc. Its cosmology is set from `cosmo`.
+            :cache_dir: A directory in which to cache a table of the growth factor
+                        on disk, keyed by a hash of the CAMB parameters. If given,
+                        the growth is interpolated from the table (which extends to
+                        z=999), and CAMB is not run if the table is already cached.
+            :max_cache_size: The maximum total size of the disk cache in bytes.
+
+        Notes
+        -----
+        CAMB results are shared (via :mod:`hmf.cosmology._camb`) with every other
+        calculation using identical parameters, in particular the
+        :class:`~hmf.density_field.transfer_models.CAMB` transfer function with the
+        same ``camb_params``, so that CAMB is run only once.
         """
 
+        _defaults = {
+            "camb_params": None,
+            "cache_dir": None,
+            "max_cache_size": _camb.DEFAULT_CACHE_SIZE,
+        }
+
         def __init__(self, *args, **kwargs):
             super(CambGrowth, self).__init__(*args, **kwargs)
 
             # Save the CAMB object properly for use
             # Set the cosmology
-            self.p = camb.CAMBparams()
-
-            if self.cosmo.Ob0 is None:
-                raise ValueError(
-                    "If using CAMB, the baryon density must be set explicitly in the cosmology."
+            if self.params["camb_params"] is None:
+                self.params["camb_params"] = _camb.default_params()
+            self.p = _camb.set_cosmology(self.params["camb_params"], self.cosmo)
+
+            if self.params["cache_dir"] is None:
+                self._lngrowth = None
+
+                # Now find the z=0 transfer
+                self._camb_transfers = _camb.get_results(self.p)
+                self._t0 = self._camb_transfers.get_redshift_evolution(
+                    1.0, 0.0, ["delta_tot"]
+                )[0][0]
+            else:
+                table = _camb.growth_table(
+                    self.p, self.params["cache_dir"], self.params["max_cache_size"]
                 )
-
-            if self.cosmo.Tcmb0.value == 0:
-                raise ValueError(
-                    "If using CAMB, the CMB temperature must be set explicitly in the cosmology."
+                self._lngrowth = _spline(
+                    table["lna"], table["lndelta"] - table["lndelta"][-1]
                 )
-
-            self.p.set_cosmology(
-                H0=self.cosmo.H0.value,
-                ombh2=self.cosmo.Ob0 * self.cosmo.h ** 2,
-                omch2=(self.cosmo.Om0 - self.cosmo.Ob0) * self.cosmo.h ** 2,
-                omk=self.cosmo.Ok0,
-                nnu=self.cosmo.Neff,
-                standard_neutrino_neff=self.cosmo.Neff,
-                TCMB=self.cosmo.Tcmb0.value,
-            )
-
-            self.p.WantTransfer = True
-
-            # Set the DE equation of state. We only support constant w.
-            if hasattr(self.cosmo, "w0"):
-                self.p.set_dark_energy(w=self.cosmo.w0)
-
-            # Now find the z=0 transfer
-            self._camb_transfers = camb.get_transfer_functions(self.p)
-            self._t0 = self._camb_transfers.get_redshift_evolution(
-                1.0, 0.0, ["delta_tot"]
-            )[0][0]
+                self._rate = self._lngrowth.derivative()
 
         def growth_factor(self, z):
             """
@@ -442,6 +807,9 @@ if HAVE_CAMB:
             float
                 The normalised growth factor.
             """
+            if self._lngrowth is not None:
+                return np.exp(self._lngrowth(-np.log1p(z)))[()]
+
             growth = (
                 self._camb_transfers.get_redshift_evolution(
                     1.0, z, ["delta_tot"]
@@ -452,3 +820,74 @@ if HAVE_CAMB:
                 return growth[0]
             else:
                 return growth
+
+        def growth_factor_and_rate(self, z, dlna=1e-3):
+            r"""
+            Calculate both the growth factor and growth rate, :math:`d\ln d/d\ln a`.
+
+            Both are calculated from a single call to CAMB, the rate by a second-order
+            backwards finite difference (CAMB cannot evaluate beyond z=0), or from
+            the cached table if `cache_dir` is given.
+
+            Parameters
+            ----------
+            z : array_like
+                The redshift.
+            dlna : float, optional
+                Step in :math:`\ln a` of the finite difference.
+
+            Returns
+            -------
+            growth_factor, growth_rate : array_like
+                The normalised growth factor and the growth rate at `z`.
+            """
+            if self._lngrowth is not None:
+                lna = -np.log1p(z)
+                return np.exp(self._lngrowth(lna))[()], self._rate(lna)[()]
+
+            scalar = np.ndim(z) == 0
+            z = np.atleast_1d(z)
+            lna = -np.log1p(z)
+            zs = np.concatenate(
+                [z, np.exp(-lna + dlna) - 1, np.exp(-lna + 2 * dlna) - 1]
+            )
+
+            lngrowth = np.log(
+                self._camb_transfers.get_redshift_evolution(
+                    1.0, zs, ["delta_tot"]
+                ).flatten()
+                / self._t0
+            ).reshape(3, -1)
+            rate = (3 * lngrowth[0] - 4 * lngrowth[1] + lngrowth[2]) / (2 * dlna)
+
+            growth = np.exp(lngrowth[0])
+            if scalar:
+                return growth[0], rate[0]
+            return growth, rate
+
+        def growth_rate(self, z):
+            r"""
+            Growth rate, :math:`d\ln d/d\ln a`.
+
+            Parameters
+            ----------
+            z : array_like
+                The redshift
+            """
+            return self.growth_factor_and_rate(z)[1]
+
+        def growth_rate_fn(self, zmin=0):
+            """
+            Growth rate, dln(d)/dln(a), as callable.
+
+            Parameters
+            ----------
+            zmin : float, optional
+                The minimum redshift of the function. Default 0.0
+
+            Returns
+            -------
+            callable
+                The growth rate as a function of redshift.
+            """
+            return self.growth_rate
@@ -9,4 +9,4 @@ from . import filters
 from .transfer import Transfer
 from .transfer_models import CAMB, EH
 from .filters import Filter
-from .halofit import halofit
+from .halofit import halofit, halofit_multi
@@ -3,14 +3,18 @@ A module containing various smoothing filter Component models,
 including the popular top-hat in real space.
 """
 
+import functools
 import numpy as np
 from scipy.interpolate import InterpolatedUnivariateSpline as _spline
-import scipy.integrate as intg
-import collections
-from .._internals import _framework, _utils
+from .._internals import _framework, _quadrature, _utils
 import warnings
 
 
+def _array_key(arr):
+    """A hashable key uniquely identifying the contents of a numpy array."""
+    return arr.dtype.str, arr.shape, arr.tobytes()
+
+
 @_framework.pluggable
 class Filter(_framework.Component):
     r"""
@@ -36,7 +40,9 @@ class Filter(_framework.Component):
     \*\*model_parameters : unpacked-dict
         As for any :class:`hmf._framework.Component` subclass, any particular
         parameters of the model may be passed to the constructor. Allowed
-        parameters are found in the :attr:`~._defaults` attribute.
+        parameters are found in the :attr:`~._defaults` attribute. Filters which
+        use the generic :meth:`sigma` and :meth:`dlnss_dlnr` accept the
+        ``precision`` parameter (see Notes).
 
     Notes
     -----
@@ -55,14 +61,38 @@ class Filter(_framework.Component):
 
     The factor :math:`\frac{d\ln R}{d\ln m}` is typically 1/3, but this is not
     necessarily the case for window functions of arbitrary shape.
+
+    Setting the model parameter ``precision="single"`` builds the :math:`kR` matrix
+    and evaluates the window function on it in single (32-bit) precision, while
+    the integrals are still accumulated in double precision. This halves the memory
+    traffic of the largest arrays in the calculation, and is useful when large
+    numbers of quick-look mass functions are required. For typical (CDM) power
+    spectra and the built-in filters, the relative error with respect to the
+    default ``precision="double"`` is below :math:`10^{-5}` for :math:`\sigma`
+    and below :math:`10^{-4}` for :math:`d\ln\sigma^2/d\ln R`.
     """
 
+    _defaults = {"precision": "double"}
+
     def __init__(self, k, power, **model_parameters):
         self.k = k
         self.power = power
 
         super(Filter, self).__init__(**model_parameters)
 
+        if self.params.get("precision", "double") not in ("double", "single"):
+            raise ValueError(
+                f"precision must be 'double' or 'single', got {self.params['precision']}"
+            )
+
+        # Window functions evaluated on the most recent kr matrix.
+        self._window_cache = {}
+
+        # Simpson weights for integrating over the (log-uniform) k grid.
+        self._weights = _quadrature.simpson_weights(
+            len(self.k), np.log(self.k[1] / self.k[0])
+        )
+
     def real_space(self, R, r):
         r"""
         Filter definition in real space.
@@ -179,15 +209,40 @@ class Filter(_framework.Component):
 
         .. math:: \frac{d\ln \sigma^2}{d\ln R} = \frac{1}{\pi^2\sigma^2} \int_0^\infty W(kR) \frac{dW(kR)}{d\ln(kR)} P(k)k^2 dk
         """
-        dlnk = np.log(self.k[1] / self.k[0])
         s = self.sigma(r)
-        rk = np.outer(r, self.k)
 
-        rest = self.power * self.k ** 3
-        w = self.k_space(rk)
-        dw = self.dw_dlnkr(rk)
-        integ = w * dw * rest
-        return intg.simps(integ, dx=dlnk, axis=-1) / (np.pi ** 2 * s ** 2)
+        rest = self.power * self.k ** 3 * self._weights
+        w = self._window(r, "k_space")
+        dw = self._window(r, "dw_dlnkr")
+        return ((w * dw) @ rest) / (np.pi ** 2 * s ** 2)
+
+    def _window(self, r, kind):
+        """
+        Evaluate a window function method on the kr matrix of the given radii.
+
+        Results for the most recent radii are cached, so that eg. :meth:`sigma` and
+        :meth:`dlnss_dlnr` evaluated on the same radii share the window function.
+
+        Parameters
+        ----------
+        r : array_like
+            Radii.
+        kind : str
+            The name of the method to evaluate on kr, either ``k_space`` or
+            ``dw_dlnkr``.
+        """
+        r = np.atleast_1d(r)
+        key = _array_key(r)
+        if self._window_cache.get("key") != key:
+            self._window_cache = {"key": key}
+
+        if kind not in self._window_cache:
+            if self.params.get("precision") == "single":
+                rk = np.outer(r.astype(np.float32), self.k.astype(np.float32))
+            else:
+                rk = np.outer(r, self.k)
+            self._window_cache[kind] = getattr(self, kind)(rk)
+        return self._window_cache[kind]
 
     def dlnr_dlnm(self, r):
         r"""
@@ -243,16 +298,116 @@ class Filter(_framework.Component):
         .. math:: \sigma^2_n(R) = \frac{1}{2\pi^2} \int_0^\infty dk\ k^{2(1+n)} P(k) W^2(kR)
         """
         if rk is None:
-            rk = np.outer(r, self.k)
-
-        dlnk = np.log(self.k[1] / self.k[0])
+            w = self._window(r, "k_space")
+        else:
+            w = self.k_space(rk)
 
         # we multiply by k because our steps are in logk.
-        rest = self.power * self.k ** (3 + order * 2)
-        integ = rest * self.k_space(rk) ** 2
-        sigma = (0.5 / np.pi ** 2) * intg.simps(integ, dx=dlnk, axis=-1)
+        rest = self.power * self.k ** (3 + order * 2) * self._weights
+        sigma = (0.5 / np.pi ** 2) * (w ** 2 @ rest)
         return np.sqrt(sigma)
 
+    def _slice_is_accurate(self, sl, r, rtol, sigma, dlnss):
+        """
+        Whether sigma and its derivative at radii `r`, integrated over the sub-grid
+        `sl` of :attr:`k`, are within `rtol` of their values `sigma` and `dlnss` on
+        the full grid.
+        """
+        filt = self.__class__(self.k[sl], self.power[sl], **self.params)
+        # A grid on which the filter raises a warning is not acceptable.
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            try:
+                return np.all(np.abs(filt.sigma(r) / sigma - 1) < rtol) and np.all(
+                    np.abs(filt.dlnss_dlnr(r) / dlnss - 1) < rtol
+                )
+            except Warning:
+                return False
+
+    def adaptive_k_slice(self, r, rtol=1e-3, guess=None):
+        r"""
+        Find a sub-grid of :attr:`k` on which sigma is integrated to a given accuracy.
+
+        Only a handful of radii, log-spaced between the extremes of `r`, are used:
+        the integrands for intermediate radii lie between those of the extremes. The
+        range of `k` is trimmed to the region in which the integrands of
+        :math:`\sigma^2` and its derivative are non-negligible for these radii, and
+        the grid is then thinned by the largest power-of-two stride for which both
+        :math:`\sigma` and :math:`d\ln\sigma^2/d\ln R` at these radii remain well
+        within ``rtol`` of their values on the full grid.
+
+        Parameters
+        ----------
+        r : array_like
+            Radii at which the filter will be evaluated.
+        rtol : float, optional
+            Target relative accuracy of both :math:`\sigma` and
+            :math:`d\ln\sigma^2/d\ln R`.
+        guess : slice, optional
+            A previously chosen slice (eg. for a slightly different power spectrum
+            or cosmology). If it is still accurate, it is returned without searching.
+
+        Returns
+        -------
+        slice
+            The slice of :attr:`k` (and :attr:`power`) to use.
+        """
+        r = np.atleast_1d(r)
+        r = np.unique(np.geomspace(r.min(), r.max(), 5))
+
+        # The (cheap) reference values on the full grid.
+        kr = np.outer(r, self.k)
+        w = self.k_space(kr)
+        dw = self.dw_dlnkr(kr)
+        rest = self.power * self.k ** 3 * self._weights
+        sigma = np.sqrt((0.5 / np.pi ** 2) * (w ** 2 @ rest))
+        dlnss = ((w * dw) @ rest) / (np.pi ** 2 * sigma ** 2)
+
+        # The error between the check radii can be larger, so leave a margin.
+        def accurate(sl):
+            return self._slice_is_accurate(sl, r, rtol / 4, sigma, dlnss)
+
+        if guess is not None and guess != slice(None) and accurate(guess):
+            return guess
+
+        # Fraction of the sigma^2 (and its derivative's) integrand below/above each
+        # k, for the worst radius.
+        integ = self.power * self.k ** 3 * (w ** 2 + np.abs(w * dw))
+        cumul = np.cumsum(integ, axis=-1)
+        below = np.max(cumul / cumul[:, -1:], axis=0)
+        above = np.max(1 - cumul / cumul[:, -1:], axis=0)[::-1]
+
+        n = len(self.k)
+
+        def odd(start, stop, step=1):
+            # Simpson's rule is most accurate for an odd number of points, so extend
+            # the slice by a point if necessary.
+            if len(range(start, stop, step)) % 2 == 0:
+                if stop + step <= n:
+                    stop += step
+                elif start - step >= 0:
+                    start -= step
+            return slice(start, stop, step)
+
+        # Trim the range, tightening the neglected fraction until accurate. A few
+        # points of padding are left at either end to catch sharp filters.
+        for frac in rtol * np.logspace(-1, -4, 4):
+            start = max(np.searchsorted(below, frac) - 2, 0)
+            stop = min(n - np.searchsorted(above, frac) + 2, n)
+            best = odd(start, stop)
+            if accurate(best):
+                break
+        else:
+            return slice(None)
+
+        # Thin the trimmed grid as far as possible.
+        step = 2
+        while (stop - start) // step >= 10 and accurate(odd(start, stop, step)):
+            best = odd(start, stop, step)
+            step *= 2
+
+        return best
+
     def nu(self, r, delta_c=1.686):
         r"""
         Peak height, :math:`\frac{\delta_c^2}{\sigma^2(r)}`.
@@ -295,13 +450,42 @@ class TopHat(Filter):
     and the derivative of the window function is
 
     .. math:: \frac{dW}{d\ln x}(x=kR) = \frac{1}{x^3}[9x\cos x + 3(x^2-3)\sin x].
+
+    The model parameter ``kernel_table`` switches on evaluation of both :math:`W(x)`
+    and :math:`dW/d\ln x` by cubic Hermite interpolation of a table precomputed
+    (once per session) on a fine grid in :math:`x`, rather than evaluating
+    trigonometric functions for every element of the :math:`kR` matrix. The
+    table is built from a series expansion at small :math:`x`, and arguments beyond
+    the end of the table are evaluated exactly. The absolute interpolation error is
+    below :math:`10^{-9}`.
     """
 
+    _defaults = {"kernel_table": False, "precision": "double"}
+
     def real_space(self, R, r):
         a = np.where(r < R, 1, 0)
         return np.where(r == R, 0.5, a)
 
     def k_space(self, kr):
+        if self.params["kernel_table"]:
+            return _tophat_kernel_table().interpolate(kr, "w")
+        if self.params["precision"] == "single":
+            # The direct formula cancels catastrophically at small kr in single
+            # precision, so use the form with a series expansion.
+            return _tophat_w(kr)
+        return self.window(kr)
+
+    @staticmethod
+    def window(kr):
+        """
+        The top-hat window function in Fourier space, evaluated directly (in double
+        precision) without instantiating a filter.
+
+        Parameters
+        ----------
+        kr : array_like
+            The scales at which to return the filter function
+        """
         return np.where(kr > 1.4e-6, (3 / kr ** 3) * (np.sin(kr) - kr * np.cos(kr)), 1)
 
     def mass_to_radius(self, m, rho_mean):
@@ -311,6 +495,10 @@ class TopHat(Filter):
         return 4 * np.pi * r ** 3 * rho_mean / 3
 
     def dw_dlnkr(self, kr):
+        if self.params["kernel_table"]:
+            return _tophat_kernel_table().interpolate(kr, "dw")
+        if self.params["precision"] == "single":
+            return _tophat_dw(kr)
         return np.where(
             kr > 1e-3,
             (9 * kr * np.cos(kr) + 3 * (kr ** 2 - 3) * np.sin(kr)) / kr ** 3,
@@ -318,6 +506,130 @@ class TopHat(Filter):
         )
 
 
+class _KernelTable:
+    """
+    A tabulated window function and its log-derivative, on a uniform grid in x.
+
+    Values are interpolated with cubic Hermite polynomials, using the tabulated
+    derivatives with respect to x. Being uniform, the grid index of any x is a
+    single multiplication, with no search required.
+
+    Parameters
+    ----------
+    funcs : dict
+        Mapping of names to a tuple of callables ``(f, df/dx)``, each returning
+        exact values for arrays of x.
+    xmax : float
+        Maximum x of the table. Larger arguments are evaluated exactly.
+    dx : float
+        Spacing of the table.
+    """
+
+    def __init__(self, funcs, xmax, dx):
+        self.funcs = funcs
+        self.xmax = xmax
+        self.dx = dx
+
+        x = np.arange(0, xmax + 2 * dx, dx)
+
+        # Polynomial coefficients (in powers of the fractional distance through
+        # each interval) of the Hermite interpolant.
+        # Single-precision copies are made for single-precision input.
+        self.coeffs = {}
+        for name, (func, deriv) in funcs.items():
+            f = func(x)
+            d = deriv(x) * dx
+            coeffs = (
+                f[:-1],
+                d[:-1],
+                3 * (f[1:] - f[:-1]) - 2 * d[:-1] - d[1:],
+                2 * (f[:-1] - f[1:]) + d[:-1] + d[1:],
+            )
+            self.coeffs[name, np.float64] = coeffs
+            self.coeffs[name, np.float32] = tuple(c.astype(np.float32) for c in coeffs)
+
+    def interpolate(self, x, name):
+        """Interpolate the function ``name`` at x."""
+        x = _as_float_array(x)
+        c0, c1, c2, c3 = self.coeffs[name, x.dtype.type]
+
+        outside = x >= self.xmax
+        has_outside = np.any(outside)
+
+        t = np.where(outside, 0, x) if has_outside else x.copy()
+        t *= 1 / self.dx
+        i = t.astype(np.intp)
+        t -= i
+
+        out = c3.take(i)
+        out *= t
+        out += c2.take(i)
+        out *= t
+        out += c1.take(i)
+        out *= t
+        out += c0.take(i)
+
+        if has_outside:
+            out[outside] = self.funcs[name][0](x[outside])
+        return out
+
+
+def _as_float_array(x):
+    """Convert to a floating-point array, keeping single precision if given."""
+    x = np.asarray(x)
+    return x if x.dtype == np.float32 else x.astype(float)
+
+
+def _tophat_w(x):
+    x = _as_float_array(x)
+    small = x < 0.1
+    xs = np.where(small, 1, x)
+    out = np.asarray(3 * (np.sin(xs) - xs * np.cos(xs)) / xs ** 3)
+
+    xs = x[small]
+    out[small] = 1 - xs ** 2 / 10 + xs ** 4 / 280 - xs ** 6 / 15120
+    return out
+
+
+def _tophat_dw(x):
+    # Note this is dW/dlnx = x dW/dx.
+    x = _as_float_array(x)
+    small = x < 0.1
+    xs = np.where(small, 1, x)
+    out = np.asarray((9 * xs * np.cos(xs) + 3 * (xs ** 2 - 3) * np.sin(xs)) / xs ** 3)
+
+    xs = x[small]
+    out[small] = -(xs ** 2) / 5 + xs ** 4 / 70 - xs ** 6 / 2520
+    return out
+
+
+def _tophat_d2w(x):
+    # The derivative of dW/dlnx with respect to x.
+    x = _as_float_array(x)
+    small = x < 0.1
+    xs = np.where(small, 1, x)
+    out = np.asarray(
+        3 * ((xs ** 3 - 9 * xs) * np.cos(xs) + (9 - 4 * xs ** 2) * np.sin(xs)) / xs ** 4
+    )
+
+    xs = x[small]
+    out[small] = -2 * xs / 5 + 2 * xs ** 3 / 35 - xs ** 5 / 420
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def _tophat_kernel_table(xmax=1000.0, dx=0.02):
+    """The (cached) kernel table of the TopHat window function."""
+    return _KernelTable(
+        {
+            "w": (_tophat_w, lambda x: _tophat_dw(x) / np.where(x > 0, x, 1)),
+            "dw": (_tophat_dw, _tophat_d2w),
+        },
+        xmax=xmax,
+        dx=dx,
+    )
+
+
 @_utils.inherit_docstrings
 class Gaussian(Filter):
     r"""
@@ -398,6 +710,9 @@ class SharpK(Filter):
     """
     _defaults = {"c": 2.5}
 
+    # Number of radius arrays for which spectral moments are memoized.
+    _n_cached_moments = 4
+
     def k_space(self, kr):
         a = np.where(kr > 1, 0, 1)
         return np.where(kr == 1, 0.5, a)
@@ -408,9 +723,14 @@ class SharpK(Filter):
     def dw_dlnkr(self, kr):
         return np.where(kr == 1, 1.0, 0.0)
 
+    def __init__(self, *args, **kwargs):
+        super(SharpK, self).__init__(*args, **kwargs)
+        self._power_spline = _spline(self.k, self.power)
+        self._moment_cache = {}
+
     def dlnss_dlnr(self, r):
         sigma = self.sigma(r)
-        power = _spline(self.k, self.power)(1 / r)
+        power = self._power_spline(1 / r)
         return -power / (2 * np.pi ** 2 * sigma ** 2 * r ** 3)
 
     def mass_to_radius(self, m, rho_mean):
@@ -422,29 +742,61 @@ class SharpK(Filter):
         return 4 * np.pi * (self.params["c"] * r) ** 3 * rho_mean / 3
 
     def sigma(self, r, order=0):
-        if not isinstance(r, collections.Iterable):
-            r = np.atleast_1d(r)
+        r = np.atleast_1d(r)
 
         if self.k.max() < 1 / r.min():
             warnings.warn("Warning: Maximum r*k less than 1!")
 
-        # # Need to re-define this because the integral needs to go exactly kr=1
-        # # or else the function 'jitters'
-        sigma = np.zeros(len(r))
-        power = _spline(self.k, self.power)
-        for i, rr in enumerate(r):
-            k = np.logspace(
-                np.log10(self.k[0]),
-                min(np.log10(self.k.max()), np.log10(1.0 / rr)),
-                max(100, len(self.k) - i),
-            )
+        return self._sigma_moments(r, (order,))[order]
 
-            p = power(k)
-            dlnk = np.log(k[1] / k[0])
-            integ = p * k ** (3 + 2 * order)
-            sigma[i] = (0.5 / (np.pi ** 2)) * intg.simps(integ, dx=dlnk)
+    def _sigma_moments(self, r, orders):
+        r"""
+        Calculate :math:`\sigma_n(r)` for several orders in a single pass.
 
-        return np.sqrt(sigma)
+        The integration grid for each radius is shared between all orders, and
+        the results are memoized per radius array, so that repeated requests for the
+        same radii do not re-run the integration loop.
+
+        Parameters
+        ----------
+        r : array_like
+            Radii.
+        orders : tuple of int
+            The orders of the moments to calculate.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping each order to the array of :math:`\sigma_n(r)`.
+        """
+        r = np.atleast_1d(r)
+        moments = self._moment_cache.setdefault(_array_key(r), {})
+        todo = [order for order in orders if order not in moments]
+
+        if todo:
+            # Need to re-define this because the integral needs to go exactly kr=1
+            # or else the function 'jitters'
+            sigma = np.zeros((len(todo), len(r)))
+            exponents = 3 + 2 * np.array(todo)[:, None]
+            for i, rr in enumerate(r):
+                k = np.logspace(
+                    np.log10(self.k[0]),
+                    min(np.log10(self.k.max()), np.log10(1.0 / rr)),
+                    max(100, len(self.k) - i),
+                )
+
+                p = self._power_spline(k)
+                weights = _quadrature.simpson_weights(len(k), np.log(k[1] / k[0]))
+                integ = p * k ** exponents
+                sigma[:, i] = (0.5 / (np.pi ** 2)) * (integ @ weights)
+
+            for order, sig in zip(todo, np.sqrt(sigma)):
+                moments[order] = sig
+
+            while len(self._moment_cache) > self._n_cached_moments:
+                del self._moment_cache[next(iter(self._moment_cache))]
+
+        return {order: moments[order] for order in orders}
 
 
 @_utils.inherit_docstrings
@@ -459,6 +811,10 @@ class SharpKEllipsoid(SharpK):
 
     _defaults = {"c": 2.0}
 
+    def __init__(self, *args, **kwargs):
+        super(SharpKEllipsoid, self).__init__(*args, **kwargs)
+        self._a3_cache = {}
+
     def xm(self, g, v):
         """
         Peak of the distribution of x, where x is the sum of the eigenvalues
@@ -503,20 +859,24 @@ class SharpKEllipsoid(SharpK):
         """
         Bardeen et al. 1986 equation 6.17
         """
-        sig_0 = self.sigma(r)
-        sig_1 = self.sigma(r, order=1)
-        sig_2 = self.sigma(r, order=2)
-        return sig_1 ** 2 / (sig_0 * sig_2)
+        moments = self._sigma_moments(r, (0, 1, 2))
+        return moments[1] ** 2 / (moments[0] * moments[2])
 
     def xi(self, pm, em):
         return ((1 + 4 * pm) ** 2 / (1 - 3 * em + pm) / (1 - 2 * pm)) ** (1.0 / 6.0)
 
     def a3(self, r):
-        g = self.gamma(r)
-        xm = self.xm(g, self.nu(r))
-        em = self.em(xm)
-        pm = self.pm(xm)
-        return r / self.xi(pm, em)
+        r = np.atleast_1d(r)
+        key = _array_key(r)
+        if key not in self._a3_cache:
+            g = self.gamma(r)
+            xm = self.xm(g, self.nu(r))
+            em = self.em(xm)
+            pm = self.pm(xm)
+            # Only the most recent radii are kept, as dlnss_dlnr and dlnr_dlnm
+            # are always called in tandem on the same radii.
+            self._a3_cache = {key: r / self.xi(pm, em)}
+        return self._a3_cache[key]
 
     def r_a3(self, rmin, rmax):
         r = np.logspace(np.log(rmin), np.log(rmax), 200, base=np.e)
@@ -527,7 +887,7 @@ class SharpKEllipsoid(SharpK):
     def dlnss_dlnr(self, r):
         a3 = self.a3(r)
         sigma = self.sigma(a3)
-        power = _spline(self.k, self.power)(1 / a3)
+        power = self._power_spline(1 / a3)
         return -power / (2 * np.pi ** 2 * sigma ** 2 * a3 ** 3)
 
     def dlnr_dlnm(self, r):
@@ -9,10 +9,10 @@ been modified to improve its integration with this package.
 import warnings
 import numpy as np
 from typing import Tuple
-from scipy.integrate import simps as _simps
-from scipy.interpolate import InterpolatedUnivariateSpline as _spline
-from ..cosmology.cosmo import Cosmology as csm
-from scipy.optimize import minimize
+from .._internals import _quadrature
+from ..cosmology.cosmo import Cosmology as csm, fast_cosmology
+from ..cosmology.growth_factor import GrowthFactor
+from scipy.optimize import brentq
 
 
 def _get_spec(
@@ -35,39 +35,44 @@ def _get_spec(
     Returns
     -------
     knl : float
-        Non-linear wavenumber
+        Non-linear wavenumber (infinite if the power is linear on all scales)
     n_eff : float
         Effective spectral index
     n_curv : float
         Curvature of the spectrum
     """
-    # Initialize sigma spline
-    def get_log_sigma2(lnr):
-        R = np.exp(lnr)
-        integrand = delta_k * np.exp(-((k * R) ** 2))
-        return np.log(_simps(integrand, np.log(k)))
+    weights = delta_k * _quadrature.simpson_weights_x(np.log(k))
 
-    def get_sigma_abs(lnr):
-        return np.abs(get_log_sigma2(lnr))
+    def get_log_sigma2(lnr):
+        return np.log(_gaussian_moments(np.atleast_1d(lnr), weights, k)[0][0])
 
-    res = minimize(
-        get_sigma_abs, x0=[1.0], options={"xatol": np.log(1.1)}, method="Nelder-Mead"
-    )
+    # ln(sigma^2) decreases with R, so its root is bracketed by the range of k.
+    lnr_min, lnr_max = -np.log(k[-1]), -np.log(k[0])
+    lnsig_min, lnsig_max = get_log_sigma2(lnr_min), get_log_sigma2(lnr_max)
 
-    if not res.success:
+    if lnsig_min < 0:
+        # sigma < 1 on all scales: the non-linear scale is at R -> 0, in which limit
+        # the power is linear, n_eff -> -3 and n_curv -> 0.
         warnings.warn(
-            f"Could not determine non-linear scale! Failed with error: {res.message}. "
-            f"Continuing with best-fit non-linear scale: r_nl={np.exp(res.x)}, with log_sigma^2 = {res.fun}"
+            "Could not determine non-linear scale! sigma < 1 on all scales, "
+            "so the power spectrum is linear."
         )
+        return np.inf, -3.0, 0.0
+    elif lnsig_max > 0:
+        warnings.warn(
+            "Could not determine non-linear scale! sigma > 1 on all scales. "
+            f"Continuing with the largest scale, r_nl={np.exp(lnr_max)}."
+        )
+        lnr = lnr_max
+    else:
+        lnr = brentq(get_log_sigma2, lnr_min, lnr_max, xtol=1e-10)
 
-    rnl = np.exp(res.x)
-    knl = 1 / rnl
-
-    lnr = np.linspace(np.log(0.75 * rnl), np.log(1.25 * rnl), 20)
-    lnsig = [get_log_sigma2(r) for r in lnr]
-    sig_of_r = _spline(lnr, lnsig, k=5)
-    dev1, dev2 = sig_of_r.derivatives(np.log(rnl))[1:3]
+    # Analytic first and second derivatives of ln(sigma^2) with ln(R).
+    i0, i1, i2 = (i[0] for i in _gaussian_moments(np.atleast_1d(lnr), weights, k))
+    dev1 = -2 * i1 / i0
+    dev2 = 4 * (i2 - i1) / i0 - dev1 ** 2
 
+    knl = np.exp(-lnr)
     n_eff = -dev1 - 3.0
     n_curv = -dev2
 
@@ -110,17 +115,220 @@ def halofit(k, delta_k, sigma_8=None, z=0, cosmo=None, takahashi=True):
 
     # Get physical parameters
     rknl, neff, rncur = _get_spec(k, delta_k)
+    if np.isinf(rknl):
+        return delta_k.copy()
+
+    return _halofit_formula(
+        k, delta_k, rknl, neff, rncur, z=z, cosmo=cosmo, takahashi=takahashi
+    )
+
+
+def _gaussian_moments(
+    lnr: np.ndarray, weights: np.ndarray, k: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    r"""
+    Moments of the Gaussian-filtered power spectrum at radii ``exp(lnr)``.
+
+    Returns :math:`I_n = \int \Delta^2(k) y^{2n} e^{-y^2} d\ln k` for n=0,1,2, with
+    :math:`y=kR`, given the Simpson weights (including :math:`\Delta^2`) over ``ln k``.
+    """
+    y2 = (np.exp(lnr)[:, None] * k) ** 2
+    integ = np.exp(-y2)
+    i0 = integ @ weights
+    integ *= y2
+    i1 = integ @ weights
+    integ *= y2
+    i2 = integ @ weights
+    return i0, i1, i2
+
+
+class _GaussianSigma:
+    """
+    Gaussian-filtered variance of a power spectrum of fixed shape, as a function of
+    radius and amplitude.
+
+    In linear theory, changing the redshift or normalisation only rescales the
+    spectrum, so the table of the variance with radius can be computed once, and the
+    non-linear scale (and spectral quantities there) found for any amplitude.
+
+    Parameters
+    ----------
+    k : array_like
+        Wavenumbers.
+    delta_k : array_like
+        Dimensionless power spectrum at `k`, for an amplitude of unity.
+    n_table : int, optional
+        Number of radii in the table of sigma used to bracket the non-linear scale.
+    """
+
+    def __init__(self, k: np.ndarray, delta_k: np.ndarray, n_table: int = 200):
+        self.k = k
+        self.weights = delta_k * _quadrature.simpson_weights_x(np.log(k))
+        self.lnr = np.linspace(-np.log(k[-1]), -np.log(k[0]), n_table)
+        self.lnsig2 = np.log(self.moments(self.lnr)[0])
+
+    def moments(self, lnr: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The Gaussian moments (see :func:`_gaussian_moments`) at radii ``exp(lnr)``."""
+        return _gaussian_moments(lnr, self.weights, self.k)
+
+    def spec(self, growth: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate the nonlinear wavenumber, effective spectral index and curvature of
+        the power spectrum, for several amplitudes at once.
+
+        Parameters
+        ----------
+        growth : array_like
+            Factors (typically growth factors) by which the amplitude of the spectrum
+            is scaled.
+
+        Returns
+        -------
+        knl, n_eff, n_curv : array
+            The non-linear wavenumber, effective spectral index and curvature for each
+            amplitude. ``knl`` is infinite where the power is linear on all scales.
+        """
+        growth = np.atleast_1d(growth)
+        lnr_table, lnsig_table = self.lnr, self.lnsig2
+
+        # The non-linear scale is where ln(sigma_0^2) = -2 ln(D), and ln(sigma_0^2)
+        # decreases with radius. Bracket it on the table, then polish with Newton's
+        # method.
+        target = -2 * np.log(growth)
+
+        # If sigma < 1 on all scales, the non-linear scale is at R -> 0, in which limit
+        # n_eff -> -3 and n_curv -> 0.
+        linear = target > lnsig_table[0]
+        if np.any(linear):
+            warnings.warn(
+                "Could not determine non-linear scale for growth factors "
+                f"{growth[linear]}! sigma < 1 on all scales, so the power spectrum is "
+                "linear."
+            )
+        if np.any(target < lnsig_table[-1]):
+            warnings.warn(
+                "Could not determine non-linear scale for growth factors "
+                f"{growth[target < lnsig_table[-1]]}! Continuing with the largest "
+                "scale in the range of k."
+            )
+
+        idx = np.clip(
+            np.searchsorted(-lnsig_table, -target), 1, len(lnr_table) - 1
+        )  # lnsig_table[idx-1] >= target > lnsig_table[idx]
+        lo, hi = lnr_table[idx - 1], lnr_table[idx]
+        lnr = np.clip(
+            lo
+            + (hi - lo)
+            * (lnsig_table[idx - 1] - target)
+            / (lnsig_table[idx - 1] - lnsig_table[idx]),
+            lo,
+            hi,
+        )
+
+        for _ in range(20):
+            i0, i1, i2 = self.moments(lnr)
+            step = (np.log(i0) - target) / (-2 * i1 / i0)
+            lnr = np.clip(lnr - step, lo, hi)
+            if np.all(np.abs(step) < 1e-10):
+                break
+        i0, i1, i2 = self.moments(lnr)
+
+        # Analytic first and second derivatives of ln(sigma^2) with ln(R).
+        dev1 = -2 * i1 / i0
+        dev2 = 4 * (i2 - i1) / i0 - dev1 ** 2
+
+        knl = np.where(linear, np.inf, np.exp(-lnr))
+        n_eff = np.where(linear, -3.0, -dev1 - 3.0)
+        n_curv = np.where(linear, 0.0, -dev2)
+        return knl, n_eff, n_curv
 
+
+def halofit_multi(k, delta_k, z, growth=None, cosmo=None, takahashi=True):
+    r"""
+    Implementation of HALOFIT (Smith+2003) for many redshifts at once.
+
+    Parameters
+    ----------
+    k : array_like
+        Wavenumbers [h/Mpc].
+    delta_k : array_like
+        Dimensionless power (linear) at `k`, at a growth factor of unity (typically
+        at z=0).
+    z : array_like
+        Redshifts.
+    growth : array_like, optional
+        Growth factors at `z`, relative to that of `delta_k`. By default, calculated
+        with :class:`~hmf.cosmology.growth_factor.GrowthFactor`.
+    cosmo : :class:`astropy.cosmology.FLRW` instance, optional
+        The cosmology. Default is the default cosmology from the :mod:`hmf.cosmo`
+        module.
+    takahashi : bool, optional
+        Whether to use updated parameters from Takahashi+2012. Otherwise use
+        original from Smith+2003.
+
+    Returns
+    -------
+    nonlinear_delta_k : array_like
+        Dimensionless power with nonlinear corrections applied, with shape
+        ``(len(z), len(k))``. Where the linear power has :math:`\sigma < 1` on all
+        scales, it is returned uncorrected.
+    """
+    z = np.atleast_1d(z)
+
+    if cosmo is None:
+        cosmo = csm().cosmo
+
+    if growth is None:
+        growth = GrowthFactor(cosmo).growth_factor(z)
+    growth = np.atleast_1d(growth)
+
+    return _halofit_rescaled(
+        _GaussianSigma(k, delta_k), delta_k, z, growth, cosmo, takahashi
+    )
+
+
+def _halofit_rescaled(table, delta_k, z, growth, cosmo, takahashi):
+    """
+    HALOFIT for a spectrum `delta_k` rescaled by each of `growth`, given the
+    :class:`_GaussianSigma` table of `delta_k`.
+    """
+    rknl, neff, rncur = table.spec(growth)
+    linear = np.isinf(rknl)
+
+    plin = growth[:, None] ** 2 * delta_k
+    nonlinear_delta_k = plin.copy()
+    nonlinear_delta_k[~linear] = _halofit_formula(
+        table.k,
+        plin[~linear],
+        rknl[~linear, None],
+        neff[~linear, None],
+        rncur[~linear, None],
+        z=z[~linear, None],
+        cosmo=cosmo,
+        takahashi=takahashi,
+    )
+
+    return nonlinear_delta_k
+
+
+def _halofit_formula(k, delta_k, rknl, neff, rncur, z, cosmo, takahashi):
+    """
+    Apply the HALOFIT fitting formula, given the spectral parameters.
+
+    All arguments broadcast against each other, with `k` (and the last axis of
+    `delta_k`) being the wavenumbers.
+    """
     # Only apply the model to higher wavenumbers
     mask = k > 0.005
-    plin = delta_k[mask]
+    plin = delta_k[..., mask]
     k = k[mask]
 
     # Define the cosmology at redshift
-    omegamz = cosmo.Om(z)
-    omegavz = cosmo.Ode(z)
+    fast_cosmo = fast_cosmology(cosmo)
+    omegamz = fast_cosmo.Om(z)
+    omegavz = fast_cosmo.Ode(z)
 
-    w = cosmo.w(z)
+    w = fast_cosmo.w(z)
     fnu = cosmo.Onu0 / cosmo.Om0
 
     if takahashi:
@@ -172,24 +380,28 @@ def halofit(k, delta_k, sigma_8=None, z=0, cosmo=None, takahashi=True):
         xmu = 10 ** (-3.5442 + 0.1908 * neff)
         xnu = 10 ** (0.9589 + 1.2857 * neff)
 
-    if np.abs(1 - omegamz) > 0.01:
-        f1a = omegamz ** -0.0732
-        f2a = omegamz ** -0.1423
-        f3a = omegamz ** 0.0725
-        f1b = omegamz ** -0.0307
-        f2b = omegamz ** -0.0585
-        f3b = omegamz ** 0.0743
-        frac = omegavz / (1 - omegamz)
-        if takahashi:
-            f1 = f1b
-            f2 = f2b
-            f3 = f3b
-        else:
-            f1 = frac * f1b + (1 - frac) * f1a
-            f2 = frac * f2b + (1 - frac) * f2a
-            f3 = frac * f3b + (1 - frac) * f3a
+    f1a = omegamz ** -0.0732
+    f2a = omegamz ** -0.1423
+    f3a = omegamz ** 0.0725
+    f1b = omegamz ** -0.0307
+    f2b = omegamz ** -0.0585
+    f3b = omegamz ** 0.0743
+    if takahashi:
+        f1 = f1b
+        f2 = f2b
+        f3 = f3b
     else:
-        f1 = f2 = f3 = 1.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = omegavz / (1 - omegamz)
+        f1 = frac * f1b + (1 - frac) * f1a
+        f2 = frac * f2b + (1 - frac) * f2a
+        f3 = frac * f3b + (1 - frac) * f3a
+
+    # Close to Einstein-de Sitter, the corrections are unity.
+    eds = np.abs(1 - omegamz) <= 0.01
+    f1 = np.where(eds, 1.0, f1)
+    f2 = np.where(eds, 1.0, f2)
+    f3 = np.where(eds, 1.0, f3)
 
     y = k / rknl
 
@@ -210,7 +422,7 @@ def halofit(k, delta_k, sigma_8=None, z=0, cosmo=None, takahashi=True):
     pnl = pq + ph
 
     # We have to copy so the original data is not overwritten, giving unexpected results.
-    nonlinear_delta_k = delta_k.copy()
-    nonlinear_delta_k[mask] = pnl
+    nonlinear_delta_k = np.array(np.broadcast_to(delta_k, pnl.shape[:-1] + mask.shape))
+    nonlinear_delta_k[..., mask] = pnl
 
     return nonlinear_delta_k
@@ -6,11 +6,13 @@ calculate the transfer function, matter power spectrum and several other
 related quantities.
 """
 import numpy as np
+from scipy.interpolate import RectBivariateSpline
 from .._internals._cache import cached_quantity, parameter
-from .halofit import halofit as _hfit
+from .halofit import _GaussianSigma, _halofit_rescaled
 from ..cosmology import growth_factor as gf, cosmo
 from ..density_field import transfer_models as tm, filters
 from .._internals._framework import get_mdl
+from .._internals import _quadrature
 
 try:
     import camb
@@ -20,6 +22,49 @@ except ImportError:
     HAVE_PYCAMB = False
 
 
+# Range of ln(k) over which sigma_8 is computed, if k does not cover (-15, 9).
+_SIG8_LNK = (-8, 8)
+
+
+def _splice_lnt(transfer, lnk, old_lnk, old_lnT, dlnk):
+    """
+    Evaluate ``transfer.lnt(lnk)``, re-using the values ``old_lnT`` at ``old_lnk``
+    where the grids overlap.
+
+    Both grids must be uniform with spacing `dlnk`. If they are not aligned, the
+    transfer function is evaluated on all of `lnk`.
+    """
+    i0 = int(np.round((old_lnk[0] - lnk[0]) / dlnk))
+    aligned = len(old_lnk) > 1 and (
+        np.isclose(old_lnk[1] - old_lnk[0], dlnk, rtol=1e-10, atol=0)
+        and abs(old_lnk[0] - (lnk[0] + i0 * dlnk)) < 1e-8 * dlnk
+    )
+
+    # The overlap, as indices of lnk.
+    start = max(0, i0)
+    stop = min(len(lnk), i0 + len(old_lnk))
+    if not aligned or start >= stop:
+        return transfer.lnt(lnk)
+
+    parts = []
+    if start > 0:
+        parts.append(transfer.lnt(lnk[:start]))
+    parts.append(old_lnT[start - i0 : stop - i0])
+    if stop < len(lnk):
+        parts.append(transfer.lnt(lnk[stop:]))
+    return np.concatenate(parts)
+
+
+def _nonlinear_z_grid(zmin, zmax, dz):
+    """
+    Uniform grid of redshifts from `zmin` to `zmax` (inclusive), with steps of at
+    most `dz`.
+    """
+    # Allow for round-off, so that eg. (0, 0.3, 0.1) has three steps, not four.
+    nz = max(int(np.ceil((zmax - zmin) / dz - 1e-8)), 1)
+    return np.linspace(zmin, zmax, nz + 1)
+
+
 class Transfer(cosmo.Cosmology):
     """
     A transfer function framework.
@@ -39,8 +84,8 @@ class Transfer(cosmo.Cosmology):
     actual defaults for each parameter, use ``Transfer.get_all_parameter_defaults()``.
 
     By default, the `growth_model` is :class:`~growth_factor.GrowthFactor`. However, if
-    using a wCDM cosmology and camb is installed, it will default to
-    :class:`~growth_factor.CambGrowth`.
+    using a wCDM cosmology, it will default to :class:`~growth_factor.CambGrowth` if
+    camb is installed, and :class:`~growth_factor.ODEGrowth` otherwise.
     """
 
     def __init__(
@@ -57,6 +102,9 @@ class Transfer(cosmo.Cosmology):
         growth_model=None,
         growth_params=None,
         use_splined_growth=False,
+        nonlinear_zmin=0.0,
+        nonlinear_zmax=5.0,
+        nonlinear_dz=0.05,
         **kwargs,
     ):
 
@@ -75,6 +123,9 @@ class Transfer(cosmo.Cosmology):
         self.transfer_model = transfer_model
         self.transfer_params = transfer_params or {}
         self.takahashi = takahashi
+        self.nonlinear_zmin = nonlinear_zmin
+        self.nonlinear_zmax = nonlinear_zmax
+        self.nonlinear_dz = nonlinear_dz
 
         # Growth model has a more complicated default.
         # We set it here so that "None" is not a relevant option for self.growth_model
@@ -82,6 +133,8 @@ class Transfer(cosmo.Cosmology):
         if growth_model is None:
             if hasattr(self.cosmo, "w0") and HAVE_PYCAMB:
                 self.growth_model = "CambGrowth"
+            elif hasattr(self.cosmo, "w0"):
+                self.growth_model = "ODEGrowth"
             else:
                 self.growth_model = "GrowthFactor"
         else:
@@ -96,6 +149,14 @@ class Transfer(cosmo.Cosmology):
             self.lnk_min < self.lnk_max
         ), f"lnk_min >= lnk_max: {self.lnk_min}, {self.lnk_max}"
         assert len(self.k) > 1, f"len(k) < 2: {len(self.k)}"
+        assert (
+            len(
+                _nonlinear_z_grid(
+                    self.nonlinear_zmin, self.nonlinear_zmax, self.nonlinear_dz
+                )
+            )
+            >= 4
+        ), "The nonlinear_z range must span at least three steps of nonlinear_dz"
 
     @parameter("model")
     def growth_model(self, val):
@@ -200,6 +261,37 @@ class Transfer(cosmo.Cosmology):
         """
         return bool(val)
 
+    @parameter("res")
+    def nonlinear_zmin(self, val):
+        """
+        Minimum redshift of the interpolation table :attr:`nonlinear_power_fn`.
+
+        :type: float
+        """
+        if val < 0:
+            raise ValueError(f"nonlinear_zmin must be >= 0, got {val}")
+        return float(val)
+
+    @parameter("res")
+    def nonlinear_zmax(self, val):
+        """
+        Maximum redshift of the interpolation table :attr:`nonlinear_power_fn`.
+
+        :type: float
+        """
+        return float(val)
+
+    @parameter("res")
+    def nonlinear_dz(self, val):
+        """
+        Redshift step of the interpolation table :attr:`nonlinear_power_fn`.
+
+        :type: float
+        """
+        if val <= 0:
+            raise ValueError(f"nonlinear_dz must be > 0, got {val}")
+        return float(val)
+
     @parameter("param")
     def z(self, val):
         """
@@ -222,10 +314,42 @@ class Transfer(cosmo.Cosmology):
     # ===========================================================================
     # DERIVED PROPERTIES AND FUNCTIONS
     # ===========================================================================
+    @cached_quantity
+    def _lnk_grid(self):
+        """
+        The log-wavenumbers at which the transfer function is evaluated, and slices of
+        them giving :attr:`k` and the range used to normalise to sigma_8.
+
+        If :attr:`k` does not span the range needed for sigma_8, it is extended (with
+        the same spacing), so that the transfer function is only evaluated once.
+        """
+        lnk = np.arange(self.lnk_min, self.lnk_max, self.dlnk)
+        n = len(lnk)
+        if self.lnk_min <= -15 and self.lnk_max >= 9:
+            return lnk, slice(0, n), None
+
+        lo, hi = _SIG8_LNK
+        n_lo = max(0, int(np.ceil((self.lnk_min - lo) / self.dlnk)))
+        n_hi = max(0, int(np.ceil((hi - self.lnk_min) / self.dlnk)) - n)
+        lnk = np.concatenate(
+            (
+                self.lnk_min - self.dlnk * np.arange(n_lo, 0, -1),
+                lnk,
+                self.lnk_min + self.dlnk * np.arange(n, n + n_hi),
+            )
+        )
+
+        sig8 = slice(
+            max(0, np.searchsorted(lnk, lo, side="right") - 1),
+            np.searchsorted(lnk, hi),
+        )
+        return lnk, slice(n_lo, n_lo + n), sig8
+
     @cached_quantity
     def k(self):
         "Wavenumbers, [h/Mpc]"
-        return np.exp(np.arange(self.lnk_min, self.lnk_max, self.dlnk))
+        lnk, main, _ = self._lnk_grid
+        return np.exp(lnk[main])
 
     @cached_quantity
     def transfer(self):
@@ -234,12 +358,33 @@ class Transfer(cosmo.Cosmology):
         """
         return self.transfer_model(self.cosmo, **self.transfer_params)
 
+    @cached_quantity
+    def _lnT_grid(self):
+        """
+        The un-normalised transfer function over the full grid of :attr:`_lnk_grid`.
+
+        If only the k range has changed since the last evaluation (with the same
+        spacing), the transfer function is evaluated only on the new wavenumbers, and
+        the rest is re-used from the last evaluation.
+        """
+        lnk = self._lnk_grid[0]
+        transfer = self.transfer
+
+        last = getattr(self, "_last_lnT", None)
+        if last is not None and last[0] is transfer:
+            lnT = _splice_lnt(transfer, lnk, last[1], last[2], self.dlnk)
+        else:
+            lnT = transfer.lnt(lnk)
+
+        self._last_lnT = (transfer, lnk, lnT)
+        return lnT
+
     @cached_quantity
     def _unnormalised_lnT(self):
         """
         The un-normalised transfer function.
         """
-        return self.transfer.lnt(np.log(self.k))
+        return self._lnT_grid[self._lnk_grid[1]]
 
     @cached_quantity
     def _unnormalised_power(self):
@@ -249,17 +394,30 @@ class Transfer(cosmo.Cosmology):
         return self.k ** self.n * np.exp(self._unnormalised_lnT) ** 2
 
     @cached_quantity
-    def _unn_sig8(self):
+    def _sig8_weights(self):
+        r"""
+        The ln(k) at which the sigma_8 normalisation is integrated, and weights such
+        that the un-normalised :math:`\sigma_8^2` is ``weights @ k**n``.
+
+        The weights include the quadrature, the TopHat window and the transfer
+        function, so that they are independent of ``n``.
+        """
         # Always use a TopHat for sigma_8, and always use full k-range
-        if self.lnk_min > -15 or self.lnk_max < 9:
-            lnk = np.arange(-8, 8, self.dlnk)
-            t = self.transfer.lnt(lnk)
-            p = np.exp(lnk) ** self.n * np.exp(t) ** 2
-            filt = filters.TopHat(np.exp(lnk), p)
+        lnk, _, sig8 = self._lnk_grid
+        if sig8 is not None:
+            lnk, lnT = lnk[sig8], self._lnT_grid[sig8]
         else:
-            filt = filters.TopHat(self.k, self._unnormalised_power)
+            lnk, lnT = np.log(self.k), self._unnormalised_lnT
 
-        return filt.sigma(8.0)[0]
+        k = np.exp(lnk)
+        window = filters.TopHat.window(8.0 * k)
+        quad = _quadrature.simpson_weights(len(k), lnk[1] - lnk[0])
+        return lnk, (0.5 / np.pi ** 2) * window ** 2 * k ** 3 * np.exp(2 * lnT) * quad
+
+    @cached_quantity
+    def _unn_sig8(self):
+        lnk, weights = self._sig8_weights
+        return np.sqrt(weights @ np.exp(self.n * lnk))
 
     @cached_quantity
     def _normalisation(self):
@@ -281,7 +439,20 @@ class Transfer(cosmo.Cosmology):
     @cached_quantity
     def growth(self):
         """The instantiated growth model."""
-        return self.growth_model(self.cosmo, **self.growth_params)
+        params = self.growth_params
+        if (
+            HAVE_PYCAMB
+            and issubclass(self.growth_model, gf.CambGrowth)
+            and isinstance(self.transfer, tm.CAMB)
+            and "camb_params" not in params
+        ):
+            # Use the same CAMB run (and disk cache, unless given) as the transfer.
+            shared = {
+                key: self.transfer.params[key]
+                for key in ("camb_params", "cache_dir", "max_cache_size")
+            }
+            params = dict(shared, **params)
+        return self.growth_model(self.cosmo, **params)
 
     @cached_quantity
     def _growth_factor_fn(self):
@@ -296,11 +467,62 @@ class Transfer(cosmo.Cosmology):
         else:
             return self.growth.growth_factor(self.z)
 
+    @cached_quantity
+    def growth_rate(self):
+        r"""The logarithmic growth rate, :math:`f = d\ln D/d\ln a`."""
+        if self.use_splined_growth:
+            return self.growth.growth_rate_fn()(self.z)
+        else:
+            return self.growth.growth_rate(self.z)
+
     @cached_quantity
     def power(self):
         """Normalised log power spectrum [units :math:`Mpc^3/h^3`]."""
         return self.growth_factor ** 2 * self._power0
 
+    def power_grid(self, z):
+        """
+        Normalised linear power spectrum at many redshifts [units :math:`Mpc^3/h^3`].
+
+        This does not depend on (or update) :attr:`z`, so can be used to evaluate the
+        power at many redshifts without invalidating the cached quantities.
+
+        Parameters
+        ----------
+        z : array_like
+            Redshifts.
+
+        Returns
+        -------
+        power : array
+            The power on :attr:`k`, with shape ``(len(z), len(k))``. The result for
+            the most recent redshifts is cached (until the power spectrum or growth
+            model changes), and is read-only.
+        """
+        z = np.atleast_1d(np.asarray(z, dtype=float))
+        power0 = self._power0
+        growth_model = self.growth
+        key = (z.shape, z.tobytes(), self.use_splined_growth)
+
+        last = getattr(self, "_last_power_grid", None)
+        if (
+            last is not None
+            and last[0] is power0
+            and last[1] is growth_model
+            and last[2] == key
+        ):
+            return last[3]
+
+        if self.use_splined_growth:
+            growth = self._growth_factor_fn(z)
+        else:
+            growth = growth_model.growth_factor(z)
+
+        power = np.asarray(growth).reshape(-1, 1) ** 2 * power0
+        power.flags.writeable = False
+        self._last_power_grid = (power0, growth_model, key, power)
+        return power
+
     @cached_quantity
     def delta_k(self):
         r"""
@@ -325,6 +547,78 @@ class Transfer(cosmo.Cosmology):
         .. math:: \Delta_k = \frac{k^3 P_{\rm nl}(k)}{2\pi^2}
         """
 
-        return _hfit(
-            self.k, self.delta_k, self.sigma_8, self.z, self.cosmo, self.takahashi
+        amplitude = self._normalisation * self.growth_factor
+        return _halofit_rescaled(
+            self._halofit_table,
+            self._unnormalised_delta_k,
+            np.atleast_1d(self.z),
+            np.atleast_1d(amplitude),
+            self.cosmo,
+            self.takahashi,
+        )[0]
+
+    @cached_quantity
+    def nonlinear_power_fn(self):
+        r"""
+        Function giving the non-linear power at any wavenumber and redshift.
+
+        The non-linear power [units :math:`Mpc^3/h^3`] from HALOFIT is tabulated on
+        :attr:`k` and on redshifts from :attr:`nonlinear_zmin` to
+        :attr:`nonlinear_zmax` in steps of at most :attr:`nonlinear_dz`, and
+        interpolated with a bicubic spline in :math:`\ln k` and `z`. This does not
+        depend on :attr:`z`, so can be used to evaluate the power at many redshifts
+        without updating the framework.
+
+        The returned function has signature ``fn(k, z)``, where `k` and `z` are
+        broadcast against each other. It is only valid for redshifts in the table,
+        between :attr:`nonlinear_zmin` and :attr:`nonlinear_zmax`, and raises a
+        ``ValueError`` for any redshift outside it.
+        """
+        z = _nonlinear_z_grid(
+            self.nonlinear_zmin, self.nonlinear_zmax, self.nonlinear_dz
+        )
+
+        if self.use_splined_growth:
+            growth = self._growth_factor_fn(z)
+        else:
+            growth = self.growth.growth_factor(z)
+
+        delta_k = _halofit_rescaled(
+            self._halofit_table,
+            self._unnormalised_delta_k,
+            z,
+            self._normalisation * growth,
+            self.cosmo,
+            self.takahashi,
         )
+        lnk = np.log(self.k)
+        spl = RectBivariateSpline(
+            z, lnk, np.log(delta_k * (2 * np.pi ** 2)) - 3 * lnk, kx=3, ky=3
+        )
+
+        zmin, zmax = z[0], z[-1]
+        tol = 1e-8 * self.nonlinear_dz
+
+        def nonlinear_power_fn(k, z):
+            lnk, z = np.broadcast_arrays(np.log(k), z)
+            if np.any(z < zmin - tol) or np.any(z > zmax + tol):
+                raise ValueError(
+                    f"z must be within the table of the non-linear power, "
+                    f"[{zmin}, {zmax}]. Set nonlinear_zmin/nonlinear_zmax to extend it."
+                )
+            return np.exp(spl(z, lnk, grid=False))
+
+        return nonlinear_power_fn
+
+    @cached_quantity
+    def _unnormalised_delta_k(self):
+        """Un-normalised dimensionless power spectrum at :math:`z=0`."""
+        return self.k ** 3 * self._unnormalised_power / (2 * np.pi ** 2)
+
+    @cached_quantity
+    def _halofit_table(self):
+        """
+        Table of the Gaussian-filtered variance of the un-normalised spectrum, used by
+        HALOFIT to find the non-linear scale for any redshift or normalisation.
+        """
+        return _GaussianSigma(self.k, self._unnormalised_delta_k)
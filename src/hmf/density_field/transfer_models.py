@@ -4,13 +4,18 @@ Various models for computing the transfer function.
 Note that these are not transfer function "frameworks". The framework is found
 in :mod:`hmf.transfer`.
 """
+import itertools
+import os
 import warnings
 import pickle
 from copy import deepcopy
+from types import SimpleNamespace
 
 import numpy as np
 from scipy.interpolate import InterpolatedUnivariateSpline as spline
+from scipy.interpolate import RegularGridInterpolator
 from .._internals._framework import Component, pluggable
+from ..cosmology import _camb
 from astropy import cosmology
 
 try:
@@ -20,7 +25,100 @@ try:
 except ImportError:
     HAVE_CAMB = False
 
-_allfits = ["CAMB", "FromFile", "EH_BAO", "EH_NoBAO", "BBKS", "BondEfs"]
+_allfits = [
+    "CAMB",
+    "FromFile",
+    "EH_BAO",
+    "EH_NoBAO",
+    "BBKS",
+    "BondEfs",
+    "Emulator",
+]
+
+# Parsed transfer function files, keyed by their path, modification time and size.
+_FILE_TABLES = {}
+_MAX_FILE_TABLES = 32
+
+
+def _read_transfer_file(fname):
+    """
+    Read a transfer function file, returning the table of (k, T).
+
+    Text files are read with :func:`numpy.loadtxt`, ``.npy`` files are memory-mapped
+    (so that only the two columns used are copied into memory), and ``.npz`` files
+    must contain arrays ``k`` and ``T``. Tables with at least seven columns are taken
+    to be in CAMB format (with the total transfer in the seventh column), otherwise
+    the first two columns are (k, T).
+    """
+    if fname.endswith(".npz"):
+        with np.load(fname) as data:
+            return np.array([data["k"], data["T"]])
+
+    if fname.endswith(".npy"):
+        table = np.load(fname, mmap_mode="r")
+    else:
+        table = np.loadtxt(fname, ndmin=2)
+
+    tcol = 6 if table.shape[1] >= 7 else 1
+    return np.array([table[:, 0], table[:, tcol]])
+
+
+def _load_transfer_file(fname):
+    """
+    Get the log table of (k, T) from a transfer function file.
+
+    The file is only parsed once for each modification, and the (read-only) table
+    is shared by all users of the same file. The table is held in memory (not
+    memory-mapped), as its log must be computed anyway.
+    """
+    path = os.path.realpath(fname)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+
+    if key not in _FILE_TABLES:
+        table = np.log(_read_transfer_file(path))
+        table.flags.writeable = False
+        _FILE_TABLES[key] = table
+
+        while len(_FILE_TABLES) > _MAX_FILE_TABLES:
+            del _FILE_TABLES[next(iter(_FILE_TABLES))]
+
+    return _FILE_TABLES[key]
+
+
+# Loaded emulator tables, keyed by their path, modification time and size.
+_EMULATOR_TABLES = {}
+_MAX_EMULATOR_TABLES = 8
+
+
+def _load_emulator(fname):
+    """
+    Get the table of an emulator file written by :func:`build_emulator`.
+
+    The file is only read once for each modification, and the (read-only) arrays are
+    shared by all users of the same file.
+    """
+    path = os.path.realpath(fname)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+
+    if key not in _EMULATOR_TABLES:
+        with np.load(path) as data:
+            names = [str(name) for name in data["names"]]
+            table = {
+                "names": names,
+                "axes": tuple(data[f"axis_{name}"] for name in names),
+                "lnk": data["lnk"],
+                "residual": data["residual"],
+            }
+        for val in table["axes"] + (table["lnk"], table["residual"]):
+            val.flags.writeable = False
+        _EMULATOR_TABLES[key] = table
+
+        while len(_EMULATOR_TABLES) > _MAX_EMULATOR_TABLES:
+            del _EMULATOR_TABLES[next(iter(_EMULATOR_TABLES))]
+
+    return _EMULATOR_TABLES[key]
 
 
 @pluggable
@@ -61,13 +159,65 @@ class TransferComponent(Component):
         """
         pass
 
+    @classmethod
+    def lnt_batch(cls, lnk, Om0, Ob0, h, Tcmb0=2.7255, **model_params):
+        r"""
+        Natural log of the transfer function for many cosmologies at once.
+
+        This is only available for analytic fits, and evaluates all cosmologies in a
+        single vectorized pass, without constructing astropy cosmologies.
+
+        Parameters
+        ----------
+        lnk : array_like
+            Wavenumbers [Mpc/h], shape ``(n_k,)``.
+        Om0, Ob0, h, Tcmb0 : array_like
+            The matter and baryon density parameters, the dimensionless Hubble
+            constant and the CMB temperature [K]. Each is a scalar or has shape
+            ``(n_cosmo,)``.
+        \*\*model_params :
+            Any model-specific parameters.
+
+        Returns
+        -------
+        lnt : array
+            The log of the transfer function, shape ``(n_cosmo, n_k)``.
+        """
+        for k in model_params:
+            if k not in cls._defaults:
+                raise ValueError(
+                    f"{k} is not a valid argument for the {cls.__name__} model"
+                )
+        params = dict(cls._defaults, **model_params)
+
+        Om0, Ob0, h, Tcmb0 = (
+            np.atleast_1d(np.asarray(x, dtype=float))[:, None]
+            for x in np.broadcast_arrays(Om0, Ob0, h, Tcmb0)
+        )
+        return cls._lnt_cosmo(np.asarray(lnk), Om0, Ob0, h, Tcmb0, params)
+
+    @classmethod
+    def _lnt_cosmo(cls, lnk, Om0, Ob0, h, Tcmb0, params):
+        """
+        The log transfer function given (arrays of) cosmological parameters, which
+        broadcast against `lnk`.
+        """
+        raise NotImplementedError(
+            f"{cls.__name__} does not support batched evaluation over cosmologies"
+        )
+
 
 class FromFile(TransferComponent):
     r"""
     Import a transfer function from file.
 
     .. note:: The file should be in the same format as output from CAMB,
-              or else in two-column ASCII format (k,T).
+              or else in two-column ASCII format (k,T). It may also be a binary
+              ``.npy`` file of the same table (which is memory-mapped), or a ``.npz``
+              file with arrays ``k`` and ``T``.
+
+    The file is parsed only once (unless it is modified), and the result is shared
+    between all instances.
 
     Parameters
     ----------
@@ -84,12 +234,15 @@ class FromFile(TransferComponent):
 
     _defaults = {"fname": ""}
 
-    def _check_low_k(self, lnk, lnT, lnkmin):
+    @staticmethod
+    def _check_low_k(lnk, lnT):
         """
         Check convergence of transfer function at low k.
 
         Unfortunately, some versions of CAMB produce a transfer which has a
-        turn-up at low k, which we cut out here.
+        turn-up at low k, which we cut out here, by starting the table at the first
+        point at which the transfer is flat. The last point of the table is also
+        removed.
 
         Parameters
         ----------
@@ -98,22 +251,32 @@ class FromFile(TransferComponent):
         lnT : array_like
             Value of log(transfer)
         """
+        flat = np.abs(np.diff(lnT) / np.diff(lnk)) < 0.0001
+        start = np.argmax(flat)  # zero if it is nowhere flat
+        return lnk[start:-1], lnT[start:-1]
 
-        start = 0
-        for i in range(len(lnk) - 1):
-            if abs((lnT[i + 1] - lnT[i]) / (lnk[i + 1] - lnk[i])) < 0.0001:
-                start = i
-                break
-        lnT = lnT[start:-1]
-        lnk = lnk[start:-1]
+    def _log_table(self):
+        """The table of (lnk, lnT) defining the transfer function."""
+        return _load_transfer_file(self.params["fname"])
 
-        lnk[0] = lnkmin
-        return lnk, lnT
+    def _interpolant(self):
+        """
+        The interpolant of the log transfer function, built on first use and
+        re-used for every subsequent call.
+        """
+        if getattr(self, "_lnt_spline", None) is None:
+            lnk, lnT = self._check_low_k(*self._log_table())
+            self._lnkmin = lnk[0]
+            self._lnt_spline = spline(lnk, lnT, k=1)
+        return self._lnt_spline
 
     def lnt(self, lnk):
         r"""
         Natural log of the transfer function
 
+        The transfer function is interpolated linearly in log-space, and is constant
+        below the smallest tabulated wavenumber.
+
         Parameters
         ----------
         lnk : array_like
@@ -124,17 +287,8 @@ class FromFile(TransferComponent):
         lnt : array_like
             The log of the transfer function at lnk.
         """
-        try:
-            T = np.log(np.genfromtxt(self.params["fname"])[:, [0, 6]].T)
-        except IndexError:
-            T = np.log(np.genfromtxt(self.params["fname"])[:, [0, 1]].T)
-
-        if lnk[0] < T[0, 0]:
-            lnkout, lnT = self._check_low_k(T[0, :], T[1, :], lnk[0])
-        else:
-            lnkout = T[0, :]
-            lnT = T[1, :]
-        return spline(lnkout, lnT, k=1)(lnk)
+        interpolant = self._interpolant()
+        return interpolant(np.maximum(lnk, self._lnkmin))
 
 
 if HAVE_CAMB:
@@ -159,6 +313,12 @@ if HAVE_CAMB:
                                      kmax by using an EH model. Can cause some problems
                                      if kmax is high, since CAMB diverges from the EH
                                      approximation.
+            **cache_dir:** A directory in which to cache the CAMB transfer function on
+                           disk, keyed by a hash of the CAMB parameters, so that it is
+                           shared between processes. Default is no disk cache.
+            **max_cache_size:** The maximum total size of the disk cache in bytes,
+                                beyond which the least-recently used entries are
+                                removed.
         """
 
         _defaults = {
@@ -166,6 +326,8 @@ if HAVE_CAMB:
             "dark_energy_params": {},
             "extrapolate_with_eh": False,
             "kmax": None,
+            "cache_dir": None,
+            "max_cache_size": _camb.DEFAULT_CACHE_SIZE,
         }
 
         def __init__(self, *args, **kwargs):
@@ -180,49 +342,11 @@ if HAVE_CAMB:
             # Save the CAMB object properly for use
             # Set the cosmology
             if self.params["camb_params"] is None:
-                self.params["camb_params"] = camb.CAMBparams(
-                    DoLensing=False,
-                    Want_CMB=False,
-                    Want_CMB_lensing=False,
-                    WantCls=False,
-                    WantDerivedParameters=False,
-                )
-
-                self.params["camb_params"].Transfer.high_precision = False
-                self.params["camb_params"].Transfer.k_per_logint = 0
-
                 # If extrapolating with EH, use a lower value of kmax so that the
                 # calculation is faster.
-                if self.params["kmax"]:
-                    self.params["camb_params"].Transfer.kmax = self.params["kmax"]
-
-            if self.cosmo.Ob0 is None:
-                raise ValueError(
-                    "To use CAMB, you must set the baryon density in the cosmology explicitly."
-                )
-
-            if self.cosmo.Tcmb0.value == 0:
-                raise ValueError(
-                    "If using CAMB, the CMB temperature must be set explicitly in the cosmology."
-                )
-
-            self.params["camb_params"].set_cosmology(
-                H0=self.cosmo.H0.value,
-                ombh2=self.cosmo.Ob0 * self.cosmo.h ** 2,
-                omch2=(self.cosmo.Om0 - self.cosmo.Ob0 - self.cosmo.Onu0)
-                * self.cosmo.h ** 2,
-                mnu=sum(self.cosmo.m_nu.value),
-                neutrino_hierarchy="degenerate",
-                omk=self.cosmo.Ok0,
-                nnu=self.cosmo.Neff,
-                standard_neutrino_neff=self.cosmo.Neff,
-                TCMB=self.cosmo.Tcmb0.value,
-            )
-            self.params["camb_params"].WantTransfer = True
+                self.params["camb_params"] = _camb.default_params(self.params["kmax"])
 
-            # Set the DE equation of state. We only support constant w.
-            if isinstance(self.cosmo, cosmology.wCDM):
-                self.params["camb_params"].set_dark_energy(w=self.cosmo.w0)
+            _camb.set_cosmology(self.params["camb_params"], self.cosmo)
 
             if self.params["extrapolate_with_eh"]:
                 # Create an EH transfer to extrapolate to at high k.
@@ -243,105 +367,47 @@ if HAVE_CAMB:
                 The log of the transfer function at lnk.
             """
 
-            camb_transfers = camb.get_transfer_functions(self.params["camb_params"])
-            T = camb_transfers.get_matter_transfer_data().transfer_data
-            T = np.log(T[[0, 6], :, 0])
-
-            if lnk[0] < T[0, 0]:
-                lnkout, lnT = self._check_low_k(T[0, :], T[1, :], lnk[0])
-            else:
-                lnkout = T[0, :]
-                lnT = T[1, :]
-
-            lnT -= lnT[0]
-
+            out = super().lnt(lnk)
             if self.params["extrapolate_with_eh"]:
-                # Now add a point one e-fold above the max, with an EH-generated transfer
-                lnkout = np.concatenate((lnkout, [lnkout[-1] + 1]))
-                # normalise EH at the final CAMB point.
-                norm = self._eh.lnt(lnkout[-2]) - lnT[-1]
-                lnT = np.concatenate((lnT, [self._eh.lnt(lnkout[-1]) - norm]))
-
-                lnkmin = lnkout.min()
-                lnkmax = lnkout.max()
-
-                inner_spline = spline(lnkout, lnT, k=3)
-
-                out = np.zeros_like(lnk)
-                out[lnk < lnkmin] = 0
-                out[(lnkmin <= lnk) & (lnk <= lnkmax)] = inner_spline(
-                    lnk[(lnkmin <= lnk) & (lnk <= lnkmax)]
-                )
-                out[lnk >= lnkmax] = self._eh.lnt(lnk[lnk >= lnkmax]) - norm
-
-                return out
-            else:
-                return spline(lnkout, lnT, k=1)(lnk)
+                high = lnk >= self._lnkmax
+                out[high] = self._eh.lnt(lnk[high]) - self._eh_norm
+            return out
+
+        def _interpolant(self):
+            if not self.params["extrapolate_with_eh"]:
+                return super()._interpolant()
+
+            if getattr(self, "_lnt_spline", None) is None:
+                lnk, lnT = self._check_low_k(*self._log_table())
+
+                # Now add a point one e-fold above the max, with an EH-generated
+                # transfer, normalised to the final CAMB point.
+                lnk = np.concatenate((lnk, [lnk[-1] + 1]))
+                self._eh_norm = self._eh.lnt(lnk[-2]) - lnT[-1]
+                lnT = np.concatenate((lnT, [self._eh.lnt(lnk[-1]) - self._eh_norm]))
+
+                self._lnkmin = lnk[0]
+                self._lnkmax = lnk[-1]
+                self._lnt_spline = spline(lnk, lnT, k=3)
+            return self._lnt_spline
+
+        def _log_table(self):
+            table = _camb.transfer_table(
+                self.params["camb_params"],
+                self.params["cache_dir"],
+                self.params["max_cache_size"],
+            )
+            return table["lnk"], table["lnt"] - table["lnt"][0]
 
         def __getstate__(self):
             # We need to get rid of the CAMBparams() object, as it cannot be pickled.
             p = self.params["camb_params"]
 
-            potential_keys = [  # From https://camb.readthedocs.io/en/latest/model.html
-                "WantCls",
-                "WantTransfer",
-                "WantScalars",
-                "WantTensors",
-                "WantVectors",
-                "WantDerivedParameters",
-                "Want_cl_2D_array",
-                "Want_CMB",
-                "Want_CMB_lensing",
-                "DoLensing",
-                "NonLinear",
-                "Transfer",
-                "want_zstar",
-                "want_zdrag",
-                "min_l",
-                "max_l",
-                "max_l_tensor",
-                "max_eta_k",
-                "max_eta_k_tensor",
-                "ombh2",
-                "omch2",
-                "omk",
-                "omnuh2",
-                "H0",
-                "TCMB",
-                "YHe",
-                "num_nu_massless",
-                "num_nu_massive",
-                "nu_mass_eigenstates",
-                "share_delta_neff",
-                "InitPower",
-                "Recomb",
-                "Reion",
-                "DarkEnergy",
-                "NonLinearModel",
-                "Accuracy",
-                "SourceTerms",
-                "z_outputs",
-                "scalar_initial_condition",
-                "InitialConditionVector",
-                "OutputNormalization",
-                "Alens",
-                "MassiveNuMethod",
-                "DoLateRadTruncation",
-                "Evolve_baryon_cs",
-                "Evolve_delta_xe",
-                "Evolve_delta_Ts",
-                "Do21cm",
-                "transfer_21cm_cl",
-                "Log_lvalues",
-                "use_cl_spline_template",
-                "SourceWindows",
-            ]
-
             # Unsaveable parameters:
             # "nu_mass_degeneracies", "nu_mass_fractions", "nu_mass_numbers", "CustomSources"
 
             dct = {}
-            for pk in potential_keys:
+            for pk in _camb.PARAMS_KEYS:
                 try:
                     pickle.dumps(getattr(p, pk))
 
@@ -361,7 +427,10 @@ if HAVE_CAMB:
                 if key != "params":
                     this[key] = deepcopy(val)
 
-            this["params"] = {"camb_params": dct}
+            this["params"] = deepcopy(
+                {key: val for key, val in self.params.items() if key != "camb_params"}
+            )
+            this["params"]["camb_params"] = dct
 
             return this
 
@@ -393,20 +462,7 @@ class FromArray(FromFile):
 
     _defaults = {"k": None, "T": None}
 
-    def lnt(self, lnk):
-        r"""
-        Natural log of the transfer function
-
-        Parameters
-        ----------
-        lnk : array_like
-            Wavenumbers [Mpc/h]
-
-        Returns
-        -------
-        lnt : array_like
-            The log of the transfer function at lnk.
-        """
+    def _log_table(self):
         k = self.params["k"]
         T = self.params["T"]
 
@@ -417,12 +473,7 @@ class FromArray(FromFile):
         if len(k) != len(T):
             raise ValueError("k and T must have same length")
 
-        if lnk[0] < np.log(k.min()):
-            lnkout, lnT = self._check_low_k(np.log(k), np.log(T), lnk[0])
-        else:
-            lnkout = np.log(k)
-            lnT = np.log(T)
-        return spline(lnkout, lnT, k=1)(lnk)
+        return np.log(k), np.log(T)
 
 
 class EH_BAO(TransferComponent):
@@ -448,97 +499,135 @@ class EH_BAO(TransferComponent):
         """
         Port of ``TFset_parameters`` from original EH code.
         """
-        self.Obh2 = self.cosmo.Ob0 * self.cosmo.h ** 2
-        self.Omh2 = self.cosmo.Om0 * self.cosmo.h ** 2
-        self.f_baryon = self.cosmo.Ob0 / self.cosmo.Om0
+        p = self._derived_params(
+            self.cosmo.Om0, self.cosmo.Ob0, self.cosmo.h, self.cosmo.Tcmb0.value
+        )
+        self.h = p["h"]
+        self.Obh2 = p["Obh2"]
+        self.Omh2 = p["Omh2"]
+        self.f_baryon = p["f_baryon"]
+
+        self.theta_cmb = p["theta_cmb"]
+
+        self.z_eq = p["z_eq"]
+        self.k_eq = p["k_eq"]
+
+        self.z_drag_b1 = p["z_drag_b1"]
+        self.z_drag_b2 = p["z_drag_b2"]
+        self.z_drag = p["z_drag"]
+
+        self.r_drag = p["r_drag"]
+        self.r_eq = p["r_eq"]
+
+        self.sound_horizon = p["sound_horizon"]
+        self.k_silk = p["k_silk"]
+
+        self.alpha_c = p["alpha_c"]
+        self.beta_c = p["beta_c"]
+        self.alpha_b = p["alpha_b"]
+        self.beta_node = p["beta_node"]
+        self.beta_b = p["beta_b"]
+
+        self.sound_horizon_fit = p["sound_horizon_fit"]
+        self.alpha_gamma = p["alpha_gamma"]
+
+    @staticmethod
+    def _derived_params(Om0, Ob0, h, Tcmb0):
+        """
+        Derived parameters of the fit, for (arrays of) cosmological parameters.
+        """
+        p = {"h": h}
+        p["Obh2"] = Ob0 * h ** 2
+        p["Omh2"] = Om0 * h ** 2
+        p["f_baryon"] = Ob0 / Om0
 
-        self.theta_cmb = self.cosmo.Tcmb0.value / 2.7
+        p["theta_cmb"] = Tcmb0 / 2.7
 
-        self.z_eq = 2.5e4 * self.Omh2 * self.theta_cmb ** (-4)  # really 1+z
-        self.k_eq = 7.46e-2 * self.Omh2 * self.theta_cmb ** (-2)  # units Mpc^-1 (no h!)
+        p["z_eq"] = 2.5e4 * p["Omh2"] * p["theta_cmb"] ** (-4)  # really 1+z
+        # units Mpc^-1 (no h!)
+        p["k_eq"] = 7.46e-2 * p["Omh2"] * p["theta_cmb"] ** (-2)
 
-        self.z_drag_b1 = (
-            0.313 * self.Omh2 ** -0.419 * (1.0 + 0.607 * self.Omh2 ** 0.674)
+        p["z_drag_b1"] = (
+            0.313 * p["Omh2"] ** -0.419 * (1.0 + 0.607 * p["Omh2"] ** 0.674)
         )
-        self.z_drag_b2 = 0.238 * self.Omh2 ** 0.223
-        self.z_drag = (
+        p["z_drag_b2"] = 0.238 * p["Omh2"] ** 0.223
+        p["z_drag"] = (
             1291.0
-            * self.Omh2 ** 0.251
-            / (1.0 + 0.659 * self.Omh2 ** 0.828)
-            * (1.0 + self.z_drag_b1 * self.Obh2 ** self.z_drag_b2)
+            * p["Omh2"] ** 0.251
+            / (1.0 + 0.659 * p["Omh2"] ** 0.828)
+            * (1.0 + p["z_drag_b1"] * p["Obh2"] ** p["z_drag_b2"])
         )
 
-        self.r_drag = (
-            31.5 * self.Obh2 * self.theta_cmb ** -4 * (1000.0 / (1 + self.z_drag))
+        p["r_drag"] = (
+            31.5 * p["Obh2"] * p["theta_cmb"] ** -4 * (1000.0 / (1 + p["z_drag"]))
         )
-        self.r_eq = 31.5 * self.Obh2 * self.theta_cmb ** -4 * (1000.0 / self.z_eq)
+        p["r_eq"] = 31.5 * p["Obh2"] * p["theta_cmb"] ** -4 * (1000.0 / p["z_eq"])
 
-        self.sound_horizon = (
-            (2.0 / (3.0 * self.k_eq))
-            * np.sqrt(6.0 / self.r_eq)
+        p["sound_horizon"] = (
+            (2.0 / (3.0 * p["k_eq"]))
+            * np.sqrt(6.0 / p["r_eq"])
             * np.log(
-                (np.sqrt(1.0 + self.r_drag) + np.sqrt(self.r_drag + self.r_eq))
-                / (1.0 + np.sqrt(self.r_eq))
+                (np.sqrt(1.0 + p["r_drag"]) + np.sqrt(p["r_drag"] + p["r_eq"]))
+                / (1.0 + np.sqrt(p["r_eq"]))
             )
         )
 
-        self.k_silk = (
+        p["k_silk"] = (
             1.6
-            * self.Obh2 ** 0.52
-            * self.Omh2 ** 0.73
-            * (1.0 + (10.4 * self.Omh2) ** (-0.95))
+            * p["Obh2"] ** 0.52
+            * p["Omh2"] ** 0.73
+            * (1.0 + (10.4 * p["Omh2"]) ** (-0.95))
         )
 
-        alpha_c_a1 = (46.9 * self.Omh2) ** 0.670 * (
-            1.0 + (32.1 * self.Omh2) ** (-0.532)
+        alpha_c_a1 = (46.9 * p["Omh2"]) ** 0.670 * (
+            1.0 + (32.1 * p["Omh2"]) ** (-0.532)
         )
-        alpha_c_a2 = (12.0 * self.Omh2) ** 0.424 * (
-            1.0 + (45.0 * self.Omh2) ** (-0.582)
+        alpha_c_a2 = (12.0 * p["Omh2"]) ** 0.424 * (
+            1.0 + (45.0 * p["Omh2"]) ** (-0.582)
         )
-        self.alpha_c = alpha_c_a1 ** (-self.f_baryon) * alpha_c_a2 ** (
-            -self.f_baryon ** 3
+        p["alpha_c"] = alpha_c_a1 ** (-p["f_baryon"]) * alpha_c_a2 ** (
+            -p["f_baryon"] ** 3
         )
 
-        beta_c_b1 = 0.944 / (1.0 + (458.0 * self.Omh2) ** -0.708)
-        beta_c_b2 = (0.395 * self.Omh2) ** -0.0266
-        self.beta_c = 1.0 / (1.0 + beta_c_b1 * ((1 - self.f_baryon) ** beta_c_b2 - 1))
+        beta_c_b1 = 0.944 / (1.0 + (458.0 * p["Omh2"]) ** -0.708)
+        beta_c_b2 = (0.395 * p["Omh2"]) ** -0.0266
+        p["beta_c"] = 1.0 / (1.0 + beta_c_b1 * ((1 - p["f_baryon"]) ** beta_c_b2 - 1))
 
-        y = self.z_eq / (1 + self.z_drag)
+        y = p["z_eq"] / (1 + p["z_drag"])
         alpha_b_G = y * (
             -6 * np.sqrt(1 + y)
             + (2 + 3 * y) * np.log((np.sqrt(1 + y) + 1) / (np.sqrt(1 + y) - 1))
         )
-        self.alpha_b = (
+        p["alpha_b"] = (
             2.07
-            * self.k_eq
-            * self.sound_horizon
-            * (1.0 + self.r_drag) ** -0.75
+            * p["k_eq"]
+            * p["sound_horizon"]
+            * (1.0 + p["r_drag"]) ** -0.75
             * alpha_b_G
         )
 
-        self.beta_node = 8.41 * self.Omh2 ** 0.435
-        self.beta_b = (
+        p["beta_node"] = 8.41 * p["Omh2"] ** 0.435
+        p["beta_b"] = (
             0.5
-            + self.f_baryon
-            + (3.0 - 2.0 * self.f_baryon) * np.sqrt((17.2 * self.Omh2) ** 2 + 1.0)
+            + p["f_baryon"]
+            + (3.0 - 2.0 * p["f_baryon"]) * np.sqrt((17.2 * p["Omh2"]) ** 2 + 1.0)
+        )
+
+        # Sound horizon of the no-wiggle fit, in Mpc/h
+        p["sound_horizon_fit"] = (
+            h * 44.5 * np.log(9.83 / p["Omh2"]) / np.sqrt(1 + 10 * (p["Obh2"] ** 0.75))
         )
+        p["alpha_gamma"] = (
+            1
+            - 0.328 * np.log(431 * p["Omh2"]) * p["f_baryon"]
+            + 0.38 * np.log(22.3 * p["Omh2"]) * p["f_baryon"] ** 2
+        )
+        return p
 
     @property
     def k_peak(self):
         return 2.5 * np.pi * (1 + 0.217 * self.Omh2) / self.sound_horizon
 
-    @property
-    def sound_horizon_fit(self):
-        """
-        Sound horizon in Mpc/h
-        """
-        return (
-            self.cosmo.h
-            * 44.5
-            * np.log(9.83 / self.Omh2)
-            / np.sqrt(1 + 10 * (self.Obh2 ** 0.75))
-        )
-
     def lnt(self, lnk):
         r"""
         Natural log of the transfer function
@@ -553,15 +642,24 @@ class EH_BAO(TransferComponent):
         lnt : array_like
             The log of the transfer function at lnk.
         """
+        return self._lnt(lnk, self)
+
+    @classmethod
+    def _lnt_cosmo(cls, lnk, Om0, Ob0, h, Tcmb0, params):
+        return cls._lnt(lnk, SimpleNamespace(**cls._derived_params(Om0, Ob0, h, Tcmb0)))
+
+    @staticmethod
+    def _lnt(lnk, p):
+        """The log transfer function, given the derived parameters `p`."""
         # Get k in Mpc^-1
-        k = np.exp(lnk) * self.cosmo.h
+        k = np.exp(lnk) * p.h
 
-        q = k / (13.41 * self.k_eq)
-        ks = k * self.sound_horizon
+        q = k / (13.41 * p.k_eq)
+        ks = k * p.sound_horizon
 
-        T_c_ln_beta = np.log(np.e + 1.8 * self.beta_c * q)
+        T_c_ln_beta = np.log(np.e + 1.8 * p.beta_c * q)
         T_c_ln_nobeta = np.log(np.e + 1.8 * q)
-        T_c_C_alpha = (14.2 / self.alpha_c) + 386.0 / (1.0 + 69.9 * q ** 1.08)
+        T_c_C_alpha = (14.2 / p.alpha_c) + 386.0 / (1.0 + 69.9 * q ** 1.08)
         T_c_C_noalpha = 14.2 + 386.0 / (1.0 + 69.9 * q ** 1.08)
 
         T_c_f = 1.0 / (1.0 + (ks / 5.4) ** 4)
@@ -573,17 +671,17 @@ class EH_BAO(TransferComponent):
             T_c_ln_beta, T_c_C_alpha
         )
 
-        s_tilde = self.sound_horizon / (1.0 + (self.beta_node / ks) ** 3) ** (1.0 / 3.0)
+        s_tilde = p.sound_horizon / (1.0 + (p.beta_node / ks) ** 3) ** (1.0 / 3.0)
         ks_tilde = k * s_tilde
 
         T_b_T0 = term(T_c_ln_nobeta, T_c_C_noalpha)
         Tb1 = T_b_T0 / (1.0 + (ks / 5.2) ** 2)
-        Tb2 = (self.alpha_b / (1.0 + (self.beta_b / ks) ** 3)) * np.exp(
-            -((k / self.k_silk) ** 1.4)
+        Tb2 = (p.alpha_b / (1.0 + (p.beta_b / ks) ** 3)) * np.exp(
+            -((k / p.k_silk) ** 1.4)
         )
         T_b = np.sin(ks_tilde) / ks_tilde * (Tb1 + Tb2)
 
-        return np.log(self.f_baryon * T_b + (1 - self.f_baryon) * T_c)
+        return np.log(p.f_baryon * T_b + (1 - p.f_baryon) * T_c)
 
 
 class EH_NoBAO(EH_BAO):
@@ -601,38 +699,19 @@ class EH_NoBAO(EH_BAO):
         no model parameters.
     """
 
-    @property
-    def alpha_gamma(self):
-        return (
-            1
-            - 0.328 * np.log(431 * self.Omh2) * self.f_baryon
-            + 0.38 * np.log(22.3 * self.Omh2) * self.f_baryon ** 2
-        )
-
-    def lnt(self, lnk):
-        r"""
-        Natural log of the transfer function
-
-        Parameters
-        ----------
-        lnk : array_like
-            Wavenumbers [Mpc/h]
-
-        Returns
-        -------
-        lnt : array_like
-            The log of the transfer function at lnk.
-        """
-        k = np.exp(lnk) * self.cosmo.h
+    @staticmethod
+    def _lnt(lnk, p):
+        """The log transfer function, given the derived parameters `p`."""
+        k = np.exp(lnk) * p.h
 
-        ks = k * self.sound_horizon_fit / self.cosmo.h  # need sound horizon in Mpc here
+        ks = k * p.sound_horizon_fit / p.h  # need sound horizon in Mpc here
 
-        gamma_eff = self.Omh2 * (
-            self.alpha_gamma + (1 - self.alpha_gamma) / (1 + (0.43 * ks) ** 4)
+        gamma_eff = p.Omh2 * (
+            p.alpha_gamma + (1 - p.alpha_gamma) / (1 + (0.43 * ks) ** 4)
         )
-        q = k / (13.4 * self.k_eq)
+        q = k / (13.4 * p.k_eq)
 
-        q_eff = q * self.Omh2 / gamma_eff
+        q_eff = q * p.Omh2 / gamma_eff
 
         L0 = np.log(2 * np.e + 1.8 * q_eff)
         C0 = 14.2 + 731.0 / (1 + 62.5 * q_eff)
@@ -682,21 +761,25 @@ class BBKS(TransferComponent):
         lnt : array_like
             The log of the transfer function at lnk.
         """
-        a = self.params["a"]
-        b = self.params["b"]
-        c = self.params["c"]
-        d = self.params["d"]
-        e = self.params["e"]
-
-        Gamma = self.cosmo.Om0 * self.cosmo.h
-        q = (
-            np.exp(lnk)
-            / Gamma
-            * np.exp(
-                self.cosmo.Ob0
-                + np.sqrt(2 * self.cosmo.h) * self.cosmo.Ob0 / self.cosmo.Om0
-            )
+        return self._lnt_cosmo(
+            lnk,
+            self.cosmo.Om0,
+            self.cosmo.Ob0,
+            self.cosmo.h,
+            self.cosmo.Tcmb0.value,
+            self.params,
         )
+
+    @classmethod
+    def _lnt_cosmo(cls, lnk, Om0, Ob0, h, Tcmb0, params):
+        a = params["a"]
+        b = params["b"]
+        c = params["c"]
+        d = params["d"]
+        e = params["e"]
+
+        Gamma = Om0 * h
+        q = np.exp(lnk) / Gamma * np.exp(Ob0 + np.sqrt(2 * h) * Ob0 / Om0)
         return np.log(
             (
                 np.log(1.0 + a * q)
@@ -746,13 +829,23 @@ class BondEfs(TransferComponent):
         lnt : array_like
             The log of the transfer function at lnk.
         """
+        return self._lnt_cosmo(
+            lnk,
+            self.cosmo.Om0,
+            self.cosmo.Ob0,
+            self.cosmo.h,
+            self.cosmo.Tcmb0.value,
+            self.params,
+        )
 
-        scale = (0.3 * 0.75 ** 2) / (self.cosmo.Om0 * self.cosmo.h ** 2)
+    @classmethod
+    def _lnt_cosmo(cls, lnk, Om0, Ob0, h, Tcmb0, params):
+        scale = (0.3 * 0.75 ** 2) / (Om0 * h ** 2)
 
-        a = self.params["a"] * scale
-        b = self.params["b"] * scale
-        c = self.params["c"] * scale
-        nu = self.params["nu"]
+        a = params["a"] * scale
+        b = params["b"] * scale
+        c = params["c"] * scale
+        nu = params["nu"]
         k = np.exp(lnk)
         return np.log((1 + (a * k + (b * k) ** 1.5 + (c * k) ** 2) ** nu) ** (-1 / nu))
 
@@ -761,3 +854,133 @@ class EH(EH_BAO):
     """Alias of :class:`EH_BAO`."""
 
     pass
+
+
+class Emulator(TransferComponent):
+    r"""
+    Fast emulator of the CAMB transfer function, trained over a box of cosmological
+    parameters.
+
+    The emulator is a table of the difference between the CAMB and
+    :class:`EH_BAO` log transfer functions on a regular grid of cosmological
+    parameters, which is interpolated to the cosmology and added to the (cheap)
+    Eisenstein & Hu fit. The table is built (offline) with :func:`build_emulator`.
+
+    Cosmological parameters that are not part of the emulator's box are fixed to the
+    values of the cosmology used to build it, which is not checked.
+
+    Parameters
+    ----------
+    cosmo : :class:`astropy.cosmology.FLRW` instance
+        The cosmology used in the calculation. It must be within the box of the
+        emulator.
+    \*\*model_parameters : unpack-dict
+        Parameters specific to this model. In this case, available
+        parameters are the following. To see their default values,
+        check the :attr:`_defaults` class attribute.
+
+        :fname: str
+            Location of the emulator file, written by :func:`build_emulator`.
+        :method: str
+            The method used to interpolate between cosmologies, passed to
+            :class:`scipy.interpolate.RegularGridInterpolator`.
+    """
+
+    _defaults = {"fname": "", "method": "linear"}
+
+    def __init__(self, *args, **kwargs):
+        super(Emulator, self).__init__(*args, **kwargs)
+        self._eh = EH_BAO(self.cosmo)
+
+    def _residual(self):
+        """The emulated difference between the CAMB and EH log transfer functions."""
+        if getattr(self, "_lnt_residual", None) is None:
+            table = _load_emulator(self.params["fname"])
+
+            point = []
+            for name, axis in zip(table["names"], table["axes"]):
+                val = getattr(self.cosmo, name)
+                val = getattr(val, "value", val)
+                if not axis[0] <= val <= axis[-1]:
+                    raise ValueError(
+                        f"{name}={val} is outside the range of the emulator "
+                        f"[{axis[0]}, {axis[-1]}]"
+                    )
+                point.append(val)
+
+            interpolant = RegularGridInterpolator(
+                table["axes"], table["residual"], method=self.params["method"]
+            )
+            self._lnt_residual = (table["lnk"], interpolant(point)[0])
+        return self._lnt_residual
+
+    def lnt(self, lnk):
+        r"""
+        Natural log of the transfer function
+
+        Parameters
+        ----------
+        lnk : array_like
+            Wavenumbers [Mpc/h]
+
+        Returns
+        -------
+        lnt : array_like
+            The log of the transfer function at lnk.
+        """
+        lnk_table, residual = self._residual()
+        return self._eh.lnt(lnk) + np.interp(lnk, lnk_table, residual)
+
+
+def build_emulator(fname, box, n=5, cosmo=cosmology.Planck15, lnk=None, **camb_params):
+    r"""
+    Build an :class:`Emulator` of the CAMB transfer function, by running CAMB on a
+    regular grid of cosmological parameters.
+
+    This runs entirely locally, with one CAMB run per grid point.
+
+    Parameters
+    ----------
+    fname : str
+        The file to which to write the emulator (a ``.npz`` file).
+    box : dict
+        The range of each varied parameter of the cosmology, as ``{name: (min, max)}``,
+        eg. ``{"Om0": (0.25, 0.35), "H0": (60, 75)}``. Names are any parameters
+        accepted by ``cosmo.clone``.
+    n : int or dict, optional
+        The number of grid points for each parameter, or a dict of numbers by name.
+    cosmo : :class:`astropy.cosmology.FLRW` instance, optional
+        The cosmology defining all parameters which are not varied.
+    lnk : array_like, optional
+        The wavenumbers [h/Mpc] at which to tabulate the transfer function. By
+        default, 500 points over the default range of :class:`~hmf.Transfer`.
+    \*\*camb_params :
+        Parameters of the :class:`CAMB` transfer model (eg. ``kmax`` or
+        ``extrapolate_with_eh``).
+    """
+    if not HAVE_CAMB:
+        raise ImportError("CAMB is required to build an emulator")
+
+    if lnk is None:
+        lnk = np.linspace(np.log(1e-8), np.log(2e4), 500)
+
+    names = list(box)
+    axes = [
+        np.linspace(*box[name], n[name] if isinstance(n, dict) else n)
+        for name in names
+    ]
+
+    residual = np.empty(tuple(len(axis) for axis in axes) + (len(lnk),))
+    for index in itertools.product(*(range(len(axis)) for axis in axes)):
+        this = cosmo.clone(
+            **{name: axis[i] for name, axis, i in zip(names, axes, index)}
+        )
+        residual[index] = CAMB(this, **camb_params).lnt(lnk) - EH_BAO(this).lnt(lnk)
+
+    np.savez(
+        fname,
+        names=np.array(names),
+        lnk=lnk,
+        residual=residual,
+        **{f"axis_{name}": axis for name, axis in zip(names, axes)},
+    )
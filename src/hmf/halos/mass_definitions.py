@@ -6,10 +6,10 @@ This is primarily inspired by Benedikt Diemer's COLOSSUS code: https://bdiemer.b
 from .._internals import _framework
 import numpy as np
 import scipy as sp
-import astropy.units as u
 from astropy.cosmology import Planck15, FLRW
 import warnings
 from ..cosmology import Cosmology
+from ..cosmology.cosmo import fast_cosmology
 
 __all__ = [
     "FOF",
@@ -29,12 +29,12 @@ class MassDefinition(_framework.Component):
     @staticmethod
     def critical_density(z=0, cosmo=Planck15):
         """Get the critical density of the Universe at redshift z, units h^2 Msun / Mpc^3."""
-        return (cosmo.critical_density(z) / cosmo.h ** 2).to(u.Msun / u.Mpc ** 3).value
+        return fast_cosmology(cosmo).critical_density(z)
 
     @classmethod
     def mean_density(cls, z=0, cosmo=Planck15):
         """Get the mean density of the Universe at redshift z, units h^2 Msun / Mpc^3."""
-        return cosmo.Om(z) * cls.critical_density(z, cosmo)
+        return fast_cosmology(cosmo).mean_density(z)
 
     def halo_density(self, z=0, cosmo=Planck15):
         r"""
@@ -264,9 +264,10 @@ class SOVirial(SphericalOverdensity):
 
     def halo_density(self, z=0, cosmo=Planck15):
         """The density of haloes under this definition."""
-        x = cosmo.Om(z) - 1
+        omegamz = fast_cosmology(cosmo).Om(z)
+        x = omegamz - 1
         overdensity = 18 * np.pi ** 2 + 82 * x - 39 * x ** 2
-        return overdensity * self.mean_density(z, cosmo) / cosmo.Om(z)
+        return overdensity * self.mean_density(z, cosmo) / omegamz
 
     @property
     def colossus_name(self):
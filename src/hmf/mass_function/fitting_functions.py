@@ -289,7 +289,7 @@ class FittingFunction(_framework.Component):
     @property
     def omegam_z(self):
         """Normalised matter density at current redshift."""
-        return self.cosmo.Om(self.z)
+        return csm.fast_cosmology(self.cosmo).Om(self.z)
 
     @property
     def nu(self):
@@ -15,7 +15,7 @@ from numpy import issubclass_
 from . import fitting_functions as ff
 from ..density_field import transfer
 from .._internals._cache import parameter, cached_quantity
-from ..density_field.filters import TopHat, Filter
+from ..density_field.filters import TopHat, Filter, _array_key
 from .._internals._framework import get_mdl
 from ..halos.mass_definitions import MassDefinition as md, SOGeneric, SOMean
 
@@ -85,6 +85,7 @@ class MassFunction(transfer.Transfer):
         filter_model: [str, Filter] = TopHat,
         filter_params: [dict, None] = None,
         disable_mass_conversion: bool = True,
+        adaptive_k_rtol: [float, None] = None,
         **transfer_kwargs,
     ):
         # Call super init MUST BE DONE FIRST.
@@ -102,6 +103,7 @@ class MassFunction(transfer.Transfer):
         self.filter_model = filter_model
         self.filter_params = filter_params or {}
         self.disable_mass_conversion = disable_mass_conversion
+        self.adaptive_k_rtol = adaptive_k_rtol
 
     # ===========================================================================
     # PARAMETERS
@@ -149,6 +151,22 @@ class MassFunction(transfer.Transfer):
         """
         return bool(val)
 
+    @parameter("res")
+    def adaptive_k_rtol(self, val):
+        r"""
+        Target relative accuracy of :math:`\sigma` and :math:`d\ln\sigma/d\ln m`,
+        used to choose an adaptive k-grid for the filter.
+
+        If set, the filter integrals are performed over a sub-grid of :attr:`k`, with
+        the range and spacing chosen (given the mass range and filter) to achieve this
+        accuracy with respect to the full grid. If None, the full grid is used.
+
+        :type: float, optional
+        """
+        if val is not None and not 0 < val < 1:
+            raise ValueError(f"adaptive_k_rtol must be between 0 and 1, got {val}")
+        return val
+
     @parameter("model")
     def filter_model(self, val):
         """
@@ -293,8 +311,32 @@ class MassFunction(transfer.Transfer):
 
         Note that this filter is *not* normalised -- i.e. the output of `filter.sigma(8)`
         will not be the input `sigma_8`.
+
+        If :attr:`adaptive_k_rtol` is set, the filter is defined on a sub-grid of `k`.
         """
-        return self.filter_model(self.k, self._unnormalised_power, **self.filter_params)
+        filt = self.filter_model(self.k, self._unnormalised_power, **self.filter_params)
+
+        if self.adaptive_k_rtol:
+            radii = filt.mass_to_radius(self.m, self.mean_density0)
+
+            # Re-use the previous slice as a guess (even if the cosmology or power
+            # changed), if it is for the same k grid and filter.
+            key = (
+                self.filter_model,
+                repr(self.filter_params),
+                _array_key(self.k),
+                self.adaptive_k_rtol,
+            )
+            last = getattr(self, "_last_k_slice", None)
+            guess = last[1] if last is not None and last[0] == key else None
+
+            sl = filt.adaptive_k_slice(radii, rtol=self.adaptive_k_rtol, guess=guess)
+            self._last_k_slice = (key, sl)
+            filt = self.filter_model(
+                self.k[sl], self._unnormalised_power[sl], **self.filter_params
+            )
+
+        return filt
 
     @cached_quantity
     def halo_overdensity_mean(self):
@@ -3,7 +3,7 @@ A supporting module that provides a routine to integrate the differential hmf in
 """
 from scipy.interpolate import InterpolatedUnivariateSpline as _spline
 import numpy as np
-import scipy.integrate as intg
+from .._internals import _quadrature
 
 
 class NaNException(Exception):
@@ -68,12 +68,13 @@ def hmf_integral_gtm(M, dndm, mass_density=False):
         mf_func = _spline(np.log(m), np.log(dndlnm), k=1)
         mf = mf_func(m_upper)
 
+        weights = _quadrature.simpson_weights(
+            len(m_upper), m_upper[2] - m_upper[1], even="first"
+        )
         if not mass_density:
-            int_upper = intg.simps(np.exp(mf), dx=m_upper[2] - m_upper[1], even="first")
+            int_upper = np.exp(mf) @ weights
         else:
-            int_upper = intg.simps(
-                np.exp(m_upper + mf), dx=m_upper[2] - m_upper[1], even="first"
-            )
+            int_upper = np.exp(m_upper + mf) @ weights
     else:
         int_upper = 0
 
@@ -81,16 +82,18 @@ def hmf_integral_gtm(M, dndm, mass_density=False):
     if not mass_density:
         ngtm = np.concatenate(
             (
-                intg.cumtrapz(dndlnm[::-1], dx=np.log(m[1]) - np.log(m[0]))[::-1],
+                _quadrature.cumulative_trapezoid(
+                    dndlnm[::-1], dx=np.log(m[1]) - np.log(m[0])
+                )[::-1],
                 np.zeros(1),
             )
         )
     else:
         ngtm = np.concatenate(
             (
-                intg.cumtrapz(m[::-1] * dndlnm[::-1], dx=np.log(m[1]) - np.log(m[0]))[
-                    ::-1
-                ],
+                _quadrature.cumulative_trapezoid(
+                    m[::-1] * dndlnm[::-1], dx=np.log(m[1]) - np.log(m[0])
+                )[::-1],
                 np.zeros(1),
             )
         )
@@ -0,0 +1,60 @@
+import numpy as np
+import os
+import pytest
+
+pytest.importorskip("camb")
+
+from hmf.cosmology import _camb  # noqa: E402
+from hmf.density_field.transfer import Transfer  # noqa: E402
+
+
+def test_disk_cache(tmp_path, monkeypatch):
+    t = Transfer(
+        transfer_model="CAMB",
+        growth_model="CambGrowth",
+        transfer_params={"cache_dir": str(tmp_path)},
+        z=1.0,
+    )
+    power = t.power
+    assert len(os.listdir(tmp_path)) == 2
+
+    # A new process would have no in-memory results.
+    def fail(params):
+        raise AssertionError("CAMB should not be run")
+
+    monkeypatch.setattr(_camb, "get_results", fail)
+    t2 = Transfer(
+        transfer_model="CAMB",
+        growth_model="CambGrowth",
+        transfer_params={"cache_dir": str(tmp_path)},
+        z=1.0,
+    )
+    assert np.allclose(t2.power, power)
+    assert np.isclose(t2.growth_rate, t.growth_rate)
+
+
+def test_cached_growth_matches_camb(tmp_path):
+    from hmf.cosmology.growth_factor import CambGrowth
+    from astropy.cosmology import Planck15
+
+    z = np.array([0.0, 0.5, 2.0, 10.0])
+    cached = CambGrowth(Planck15, cache_dir=str(tmp_path))
+    direct = CambGrowth(Planck15)
+    assert np.allclose(cached.growth_factor(z), direct.growth_factor(z), rtol=1e-6)
+    assert np.allclose(cached.growth_rate(z), direct.growth_rate(z), rtol=1e-3)
+
+
+def test_cache_eviction(tmp_path):
+    for i in range(5):
+        _camb.save_cached(str(tmp_path), f"entry{i}", x=np.zeros(1000))
+        os.utime(tmp_path / f"entry{i}.npz", (i, i))
+
+    size = os.path.getsize(tmp_path / "entry0.npz")
+    _camb.save_cached(str(tmp_path), "new", max_size=3 * size, x=np.zeros(1000))
+    assert sorted(os.listdir(tmp_path)) == ["entry3.npz", "entry4.npz", "new.npz"]
+
+
+def test_corrupt_cache_entry(tmp_path):
+    (tmp_path / "bad.npz").write_bytes(b"not a zip file")
+    assert _camb.load_cached(str(tmp_path), "bad") is None
+    assert _camb.load_cached(str(tmp_path), "missing") is None
@@ -2,8 +2,12 @@ import numpy as np
 import pytest
 import deprecation
 
-from hmf.cosmology.cosmo import Cosmology, astropy_to_colossus
-from astropy.cosmology import WMAP7
+from hmf.cosmology.cosmo import Cosmology, astropy_to_colossus, fast_cosmology
+from astropy.cosmology import WMAP7, Flatw0waCDM, FLRW, FlatFLRWMixin, Parameter
+from hmf.cosmology.growth_factor import GrowthFactor
+from hmf.density_field.halofit import halofit
+from hmf.halos.mass_definitions import SOVirial
+import astropy.units as u
 
 
 def test_string_cosmo():
@@ -40,3 +44,109 @@ def test_cosmo_to_colossus():
 
     assert colossus.sigma8 == 0.8
     assert colossus.ns == 1.0
+
+
+@pytest.mark.parametrize(
+    "astropy_cosmo", [WMAP7, Flatw0waCDM(H0=70, Om0=0.3, w0=-0.9, wa=0.3, Tcmb0=2.7)]
+)
+def test_fast_cosmology(astropy_cosmo):
+    fast = fast_cosmology(astropy_cosmo)
+    assert fast_cosmology(astropy_cosmo) is fast
+
+    # Includes redshifts outside the table.
+    z = np.array([0, 0.5, 3, 1e3, 1e6, 2e9, -0.6])
+    for name in ["efunc", "Om", "Ode", "w"]:
+        assert np.allclose(
+            getattr(fast, name)(z), getattr(astropy_cosmo, name)(z), rtol=1e-9, atol=0
+        )
+        assert np.isclose(
+            getattr(fast, name)(1.5), getattr(astropy_cosmo, name)(1.5), rtol=1e-9
+        )
+    assert fast.efunc(z[:, None]).shape == (len(z), 1)
+
+    rho_c = (astropy_cosmo.critical_density(z) / astropy_cosmo.h ** 2).to(
+        u.Msun / u.Mpc ** 3
+    )
+    assert np.allclose(fast.critical_density(z), rho_c.value, rtol=1e-9)
+    assert np.allclose(
+        fast.mean_density(z), astropy_cosmo.Om(z) * rho_c.value, rtol=1e-9
+    )
+
+
+def test_fast_cosmo_updates(cosmo):
+    cosmo.update(cosmo_params={"Om0": 0.25})
+    fast = cosmo.fast_cosmo
+    assert np.isclose(fast.Om(1.0), cosmo.cosmo.Om(1.0), rtol=1e-9)
+    cosmo.update(cosmo_params={"Om0": 0.3})
+    assert cosmo.fast_cosmo is not fast
+    assert np.isclose(cosmo.fast_cosmo.Om(1.0), cosmo.cosmo.Om(1.0), rtol=1e-9)
+
+
+def test_fast_cosmology_lookup():
+    cosmo = WMAP7.clone(Om0=0.29)
+    fast = fast_cosmology(cosmo)
+    assert fast_cosmology(cosmo) is fast
+
+    # A different object with the same parameters shares the tables.
+    assert fast_cosmology(WMAP7.clone(Om0=0.29)) is fast
+    assert fast_cosmology(WMAP7.clone(Om0=0.3)) is not fast
+
+
+class AlphaCDM(FlatFLRWMixin, FLRW):
+    """A flat cosmology with an extra Parameter, for which w(a) = -1 + alpha(1-a)."""
+
+    alpha = Parameter(doc="Slope of w(a).", fvalidate="float")
+
+    def __init__(self, H0, Om0, alpha=0.0, **kwargs):
+        super().__init__(H0=H0, Om0=Om0, Ode0=0.0, **kwargs)
+        self.alpha = alpha
+
+    def w(self, z):
+        z = np.asarray(z)
+        return -1.0 + self.alpha * z / (1 + z)
+
+    def de_density_scale(self, z):
+        zp1 = 1.0 + np.asarray(z)
+        return zp1 ** (3 * self.alpha) * np.exp(-3 * self.alpha * (zp1 - 1) / zp1)
+
+
+def test_fast_cosmology_custom_parameter():
+    # Cosmologies differing only in a Parameter of a custom subclass must not
+    # share tables.
+    cosmo0 = AlphaCDM(H0=70, Om0=0.3)
+    cosmo1 = AlphaCDM(H0=70, Om0=0.3, alpha=0.5)
+    fast0, fast1 = fast_cosmology(cosmo0), fast_cosmology(cosmo1)
+    assert fast0 is not fast1
+    assert fast_cosmology(AlphaCDM(H0=70, Om0=0.3, alpha=0.5)) is fast1
+
+    z = np.array([0.5, 1.0, 3.0])
+    for astropy_cosmo, fast in [(cosmo0, fast0), (cosmo1, fast1)]:
+        for name in ["efunc", "Om", "Ode", "w"]:
+            assert np.allclose(
+                getattr(fast, name)(z), getattr(astropy_cosmo, name)(z), rtol=1e-9
+            )
+
+        # Users of the fast cosmology.
+        omz = astropy_cosmo.Om(1.0)
+        x = omz - 1
+        assert np.isclose(
+            SOVirial().halo_density(1.0, astropy_cosmo),
+            (18 * np.pi ** 2 + 82 * x - 39 * x ** 2)
+            * SOVirial().mean_density(1.0, astropy_cosmo)
+            / omz,
+            rtol=1e-9,
+        )
+
+    assert not np.isclose(
+        GrowthFactor(cosmo0).growth_factor(1.0),
+        GrowthFactor(cosmo1).growth_factor(1.0),
+        rtol=1e-4,
+    )
+
+    k = np.logspace(-2, 1, 50)
+    delta_k = 1e3 * k ** 3 * (1 + k ** 2) ** -2
+    assert not np.allclose(
+        halofit(k, delta_k, z=1.0, cosmo=cosmo0),
+        halofit(k, delta_k, z=1.0, cosmo=cosmo1),
+        rtol=1e-4,
+    )
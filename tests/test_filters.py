@@ -72,6 +72,26 @@ class TestTopHat:
         print(true, cls.dlnss_dlnr(R))
         assert np.isclose(cls.dlnss_dlnr(R), true)
 
+    def test_kernel_table(self, cls):
+        tab = filters.TopHat(cls.k, cls.power, kernel_table=True)
+        x = np.logspace(-8, 4, 1000)
+
+        # Compare to the exact functions, which are stable at small x.
+        assert np.allclose(tab.k_space(x), filters._tophat_w(x), rtol=0, atol=1e-9)
+        assert np.allclose(tab.dw_dlnkr(x), filters._tophat_dw(x), rtol=0, atol=1e-9)
+
+        r = np.logspace(0, 1, 10)
+        assert np.allclose(tab.sigma(r), cls.sigma(r), rtol=1e-8)
+        assert np.allclose(tab.dlnss_dlnr(r), cls.dlnss_dlnr(r), rtol=1e-6)
+
+    def test_window_cache(self, cls):
+        r = np.array([1.0, 2.0])
+        cls.sigma(r)
+        w = cls._window_cache["k_space"]
+        cls.dlnss_dlnr(r)
+        assert cls._window_cache["k_space"] is w
+        assert "dw_dlnkr" in cls._window_cache
+
 
 class TestSharpK:
     @pytest.fixture(scope="class")
@@ -195,3 +215,79 @@ class TestGaussian:
 
         print(true, cls.dlnss_dlnr(R))
         assert np.isclose(cls.dlnss_dlnr(R), true)
+
+
+class TestSharpKEllipsoid:
+    @pytest.fixture(scope="class")
+    def cls(self):
+        k = np.logspace(-6, 0, 10000)
+        pk = k ** 2
+        return filters.SharpKEllipsoid(k, pk)
+
+    def test_moments_match_sigma(self, cls):
+        r = np.array([1.0, 2.0, 3.0])
+        moments = cls._sigma_moments(r, (0, 1, 2))
+        for order in range(3):
+            fresh = filters.SharpK(cls.k, cls.power, c=cls.params["c"])
+            assert np.allclose(moments[order], fresh.sigma(r, order))
+
+    def test_moments_memoized(self, cls):
+        r = np.linspace(1.5, 4.0, 5)
+        first = cls._sigma_moments(r, (0, 1, 2))
+        second = cls._sigma_moments(r.copy(), (0, 1, 2))
+        for order in range(3):
+            assert first[order] is second[order]
+
+    def test_a3_memoized(self, cls):
+        r = np.linspace(1.5, 4.0, 5)
+        assert cls.a3(r) is cls.a3(r.copy())
+        assert np.all(np.isfinite(cls.dlnss_dlnr(r)))
+        assert np.all(np.isfinite(cls.dlnr_dlnm(r)))
+
+
+@pytest.fixture(scope="module")
+def cdm_power():
+    from hmf import Transfer
+
+    t = Transfer(transfer_model="EH")
+    return t.k, t._unnormalised_power
+
+
+@pytest.mark.parametrize(
+    "filt, params",
+    [
+        (filters.TopHat, {}),
+        (filters.TopHat, {"kernel_table": True}),
+        (filters.Gaussian, {}),
+    ],
+)
+def test_single_precision_bounds(cdm_power, filt, params):
+    k, power = cdm_power
+    double = filt(k, power, **params)
+    single = filt(k, power, precision="single", **params)
+
+    r = double.mass_to_radius(np.logspace(3, 18, 300), 8.5e10)
+    assert np.allclose(single.sigma(r), double.sigma(r), rtol=1e-5, atol=0)
+    assert np.allclose(single.dlnss_dlnr(r), double.dlnss_dlnr(r), rtol=1e-4, atol=0)
+    assert single._window_cache["k_space"].dtype == np.float32
+
+
+def test_bad_precision():
+    with pytest.raises(ValueError):
+        filters.TopHat(np.logspace(-3, 3, 100), np.ones(100), precision="half")
+
+
+@pytest.mark.parametrize(
+    "filt", [filters.TopHat, filters.Gaussian, filters.SharpK, filters.SharpKEllipsoid]
+)
+@pytest.mark.parametrize("rtol", [1e-2, 1e-3])
+def test_adaptive_k_slice(cdm_power, filt, rtol):
+    k, power = cdm_power
+    full = filt(k, power)
+    r = full.mass_to_radius(np.logspace(10, 15, 50), 8.5e10)
+
+    sl = full.adaptive_k_slice(r, rtol=rtol)
+    sub = filt(k[sl], power[sl])
+
+    assert np.allclose(sub.sigma(r), full.sigma(r), rtol=rtol, atol=0)
+    assert np.allclose(sub.dlnss_dlnr(r), full.dlnss_dlnr(r), rtol=rtol, atol=0)
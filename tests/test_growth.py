@@ -55,3 +55,159 @@ def test_inverse(gf, genf):
     gf = np.linspace(0.15, 0.99, 10)
     print(gf_func(gf), genf_func(gf))
     assert np.allclose(gf_func(gf), genf_func(gf), rtol=1e-1)
+
+
+def test_gf_array(gf):
+    z = np.linspace(0, 8, 50)
+    assert np.allclose(gf.growth_factor(z), [gf.growth_factor(zz) for zz in z])
+    assert gf.growth_factor(0.0) == 1.0
+
+
+def test_gf_array_matches_direct_integral():
+    from scipy.integrate import quad
+
+    g = growth_factor.GrowthFactor(Planck13)
+
+    def dplus(z):
+        integral = quad(
+            lambda a: 1 / (a * Planck13.efunc(1 / a - 1)) ** 3, 0, 1 / (1 + z)
+        )[0]
+        return Planck13.efunc(z) * integral
+
+    # Includes negative redshifts, outside the table.
+    z = np.array([-0.5, -0.2, 0.5, 2.0, 10.0])
+    direct = np.array([dplus(zz) for zz in z]) / dplus(0)
+    assert np.allclose(g.growth_factor(z), direct, rtol=1e-6)
+    assert np.isclose(g.growth_factor(-0.5), direct[0], rtol=1e-6)
+
+
+def test_table_shared_between_instances():
+    from astropy.cosmology import FlatLambdaCDM
+
+    a = growth_factor.GrowthFactor(Planck13)
+    b = growth_factor.GrowthFactor(Planck13)
+    assert a._table() is b._table()
+    assert a.growth_factor_fn() is b.growth_factor_fn()
+
+    c = growth_factor.GrowthFactor(FlatLambdaCDM(H0=70, Om0=0.3))
+    assert c._table() is not a._table()
+    assert not np.isclose(c.growth_factor(2.0), a.growth_factor(2.0))
+
+
+def test_no_zvec_state(gf):
+    gf.growth_factor_fn()
+    gf.growth_factor_fn(inverse=True)
+    assert not hasattr(gf, "_zvec")
+
+
+@pytest.mark.parametrize("z", [0.0, 0.5, 2.0, 10.0])
+def test_ode_matches_integral_lcdm(z):
+    from astropy.cosmology import FlatLambdaCDM
+
+    # Without radiation, the integral solution is exact in LCDM.
+    cosmo = FlatLambdaCDM(H0=70, Om0=0.3)
+    ode = growth_factor.ODEGrowth(cosmo)
+    integ = growth_factor.GrowthFactor(cosmo)
+
+    assert np.isclose(ode.growth_factor(z), integ.growth_factor(z), rtol=1e-6)
+
+
+def test_ode_growth_rate_is_derivative():
+    from astropy.cosmology import Flatw0waCDM
+
+    ode = growth_factor.ODEGrowth(Flatw0waCDM(H0=70, Om0=0.3, w0=-0.9, wa=0.3))
+    z = np.linspace(0, 5, 20)
+    lna = -np.log1p(z)
+    h = 1e-4
+    num = (
+        np.log(ode.growth_factor(np.exp(-(lna + h)) - 1))
+        - np.log(ode.growth_factor(np.exp(-(lna - h)) - 1))
+    ) / (2 * h)
+    assert np.allclose(ode.growth_rate(z), num, rtol=1e-5)
+    assert np.allclose(ode.growth_rate_fn()(z), ode.growth_rate(z))
+
+
+def test_ode_functions(gf):
+    ode = growth_factor.ODEGrowth(Planck13)
+    z = np.linspace(0, 5, 10)
+    assert np.allclose(ode.growth_factor_fn()(z), ode.growth_factor(z))
+    assert np.allclose(ode.growth_factor_fn(inverse=True)(ode.growth_factor(z)), z)
+    assert np.allclose(ode.growth_factor(z), gf.growth_factor(z), rtol=1e-2)
+    assert ode._table() is growth_factor.ODEGrowth(Planck13)._table()
+
+
+def test_genmf_array(genf):
+    # The spline is defined up to the maximum redshift, so scalar calls differ
+    # slightly from array calls.
+    z = np.linspace(0, 8, 200)
+    assert np.allclose(
+        genf.growth_factor(z), [genf.growth_factor(zz)[0] for zz in z], rtol=1e-6
+    )
+
+
+@pytest.mark.parametrize("z", [0.0, 1.0, 5.0])
+def test_growth_factor_and_rate(gf, z):
+    d, f = gf.growth_factor_and_rate(np.array([z, 2 * z]))
+    assert np.allclose(d, gf.growth_factor(np.array([z, 2 * z])))
+    assert np.allclose(f, gf.growth_rate(np.array([z, 2 * z])))
+
+
+def test_gr_is_derivative(gf):
+    z = np.linspace(0, 5, 20)
+    lna = -np.log1p(z)
+    h = 1e-4
+    num = (
+        np.log(gf.growth_factor(np.exp(-(lna + h)) - 1))
+        - np.log(gf.growth_factor(np.exp(-(lna - h)) - 1))
+    ) / (2 * h)
+    assert np.allclose(gf.growth_rate(z), num, rtol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "model", ["GrowthFactor", "GenMFGrowth", "Carroll1992", "ODEGrowth", "CambGrowth"]
+)
+def test_growth_rate_all_models(model):
+    from hmf import Transfer
+
+    growth = getattr(growth_factor, model)(Planck13)
+    # CAMB can not be evaluated at negative redshift, so keep away from z=0.
+    z = np.array([0.2, 1.0, 3.0])
+
+    d, f = growth.growth_factor_and_rate(z)
+    assert np.allclose(d, growth.growth_factor(z))
+    assert np.allclose(growth.growth_rate(z), f)
+    assert np.allclose(growth.growth_rate_fn()(z), f, rtol=1e-4)
+
+    # The rate is (close to) the derivative of the model's own growth factor. The
+    # approximate models use Hamilton's formula, which is only exact for the true D.
+    rtol = 5e-2 if model == "Carroll1992" else 1e-2
+    lna = -np.log1p(z)
+    h = 1e-3
+    num = (
+        np.log(growth.growth_factor(np.exp(-(lna + h)) - 1))
+        - np.log(growth.growth_factor(np.exp(-(lna - h)) - 1))
+    ) / (2 * h)
+    assert np.allclose(f, num, rtol=rtol)
+
+    t = Transfer(
+        transfer_model="EH", growth_model=model, z=1.0, cosmo_model=Planck13
+    )
+    assert np.isclose(t.growth_rate, f[1], rtol=1e-4)
+
+
+def test_gr_matches_ode():
+    # Without radiation, the integral solution is exact.
+    from astropy.cosmology import FlatLambdaCDM
+
+    cosmo = FlatLambdaCDM(H0=70, Om0=0.3)
+    z = np.linspace(0, 10, 10)
+    assert np.allclose(
+        growth_factor.GrowthFactor(cosmo).growth_rate(z),
+        growth_factor.ODEGrowth(cosmo).growth_rate(z),
+        rtol=1e-6,
+    )
+    assert np.allclose(
+        growth_factor.GenMFGrowth(cosmo).growth_rate(z),
+        growth_factor.ODEGrowth(cosmo).growth_rate(z),
+        rtol=1e-5,
+    )
@@ -1,3 +1,4 @@
+import pytest
 from hmf.density_field import transfer
 import numpy as np
 
@@ -46,3 +47,63 @@ def test_halofit_high_s8():
     )
     assert np.isclose(t.nonlinear_power[0], thi.nonlinear_power[0], rtol=2e-2)
     assert np.isclose(t.nonlinear_power[-1], thi.nonlinear_power[-1], rtol=5e-2)
+
+
+def test_halofit_multi():
+    from hmf.density_field import halofit_multi
+
+    t = transfer.Transfer(transfer_model="EH", lnk_max=7)
+    z = np.array([0.0, 0.5, 2.0])
+    growth = np.array([t.growth.growth_factor(zz) for zz in z])
+
+    pnl = halofit_multi(t.k, t.delta_k, z, growth=growth, cosmo=t.cosmo)
+    assert pnl.shape == (3, len(t.k))
+
+    for i, zz in enumerate(z):
+        t.update(z=zz)
+        assert np.allclose(pnl[i], t.nonlinear_delta_k, rtol=1e-8)
+
+
+def test_halofit_multi_linear():
+    from hmf.density_field import halofit_multi
+
+    t = transfer.Transfer(transfer_model="EH", lnk_max=7)
+    pnl = halofit_multi(t.k, t.delta_k, [50.0], growth=[1e-3], cosmo=t.cosmo)
+    assert np.allclose(pnl[0], 1e-6 * t.delta_k)
+
+
+def test_get_spec_matches_multi():
+    import sys
+
+    hf = sys.modules["hmf.density_field.halofit"]
+    t = transfer.Transfer(transfer_model="EH", lnk_max=7)
+
+    single = hf._get_spec(t.k, t.delta_k)
+    multi = hf._GaussianSigma(t.k, t.delta_k).spec(1.0)
+    assert np.allclose(single, [m[0] for m in multi], rtol=1e-8)
+
+
+def test_halofit_linear_warning():
+    t = transfer.Transfer(transfer_model="EH", lnk_max=7, z=20.0)
+    with pytest.warns(UserWarning, match="non-linear scale"):
+        assert np.allclose(t.nonlinear_power, t.power)
+
+
+def test_table_reused_across_rescalings():
+    import sys
+
+    hf = sys.modules["hmf.density_field.halofit"]
+    t = transfer.Transfer(transfer_model="EH", lnk_max=7)
+    table = t._halofit_table
+
+    for params in [{"z": 1.0}, {"sigma_8": 0.9}, {"z": 3.0, "sigma_8": 0.7}]:
+        t.update(**params)
+        assert t._halofit_table is table
+        assert np.allclose(
+            t.nonlinear_delta_k,
+            hf.halofit(t.k, t.delta_k, z=t.z, cosmo=t.cosmo),
+            rtol=1e-8,
+        )
+
+    t.update(n=0.95)
+    assert t._halofit_table is not table
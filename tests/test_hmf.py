@@ -1,5 +1,6 @@
 from pytest import raises
 from hmf import MassFunction
+from hmf.density_field.filters import Filter
 import numpy as np
 import warnings
 
@@ -46,3 +47,42 @@ def test_mass_nonlinear_outside_range():
     with warnings.catch_warnings(record=True) as w:
         assert h.mass_nonlinear > 0
         assert len(w)
+
+
+def test_adaptive_k_rtol():
+    h = MassFunction(transfer_model="EH")
+    h_adapt = MassFunction(transfer_model="EH", adaptive_k_rtol=1e-3)
+
+    assert len(h_adapt.filter.k) < len(h.k)
+    assert np.allclose(h_adapt.sigma, h.sigma, rtol=1e-3, atol=0)
+    assert np.allclose(h_adapt.dndm, h.dndm, rtol=2e-3, atol=0)
+
+
+def test_adaptive_k_slice_reused(monkeypatch):
+    h = MassFunction(transfer_model="EH", adaptive_k_rtol=1e-3)
+    h.filter
+
+    # Only the previous slice should be checked when the power or cosmology change.
+    calls = []
+    check = Filter._slice_is_accurate
+
+    def counting_check(self, *args, **kwargs):
+        calls.append(1)
+        return check(self, *args, **kwargs)
+
+    monkeypatch.setattr(Filter, "_slice_is_accurate", counting_check)
+    for params in ({"n": 0.95}, {"cosmo_params": {"Om0": 0.31}}):
+        calls.clear()
+        h.update(**params)
+        h.filter
+        assert len(calls) == 1
+    monkeypatch.undo()
+
+    h_full = MassFunction(transfer_model="EH", n=0.95, cosmo_params={"Om0": 0.31})
+    assert np.allclose(h.sigma, h_full.sigma, rtol=1e-3, atol=0)
+    assert np.allclose(h.dndm, h_full.dndm, rtol=2e-3, atol=0)
+
+
+def test_bad_adaptive_k_rtol():
+    with raises(ValueError):
+        MassFunction(adaptive_k_rtol=0)
@@ -0,0 +1,57 @@
+import pytest
+
+import numpy as np
+
+from hmf._internals import _quadrature
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 11, 80])
+@pytest.mark.parametrize("even", ["avg", "first", "last", "simpson"])
+def test_simpson_weights_polynomial(n, even):
+    # All schemes are exact for straight lines.
+    x = np.linspace(0, 2, n)
+    assert np.isclose((3 * x + 1) @ _quadrature.simpson_weights(n, x[1], even), 8)
+    assert np.isclose((3 * x + 1) @ _quadrature.simpson_weights_x(x, even), 8)
+
+
+@pytest.mark.parametrize("n", [11, 80])
+def test_simpson_weights_x_uniform(n):
+    x = np.linspace(-1, 3, n)
+    assert np.allclose(
+        _quadrature.simpson_weights_x(x), _quadrature.simpson_weights(n, x[1] - x[0])
+    )
+
+
+@pytest.mark.parametrize("n", [21, 22])
+def test_simpson_weights_quadratic(n):
+    # Exact for quadratics on any grid (except for the trapezoid in the even case).
+    x = np.sort(np.random.default_rng(1).uniform(0, 1, n))
+    x[0], x[-1] = 0, 1
+    assert np.isclose(x ** 2 @ _quadrature.simpson_weights_x(x, "simpson"), 1 / 3)
+
+
+def test_simpson_weights_readonly():
+    w = _quadrature.simpson_weights(11)
+    assert w is not _quadrature.simpson_weights(11)
+    assert not _quadrature._unit_weights(11, "avg").flags.writeable
+
+
+def test_bad_even():
+    with pytest.raises(ValueError):
+        _quadrature.simpson_weights(10, even="mean")
+
+
+def test_cumulative_trapezoid():
+    x = np.linspace(0, 1, 101)
+    y = np.vstack((x, 2 * x))
+    res = _quadrature.cumulative_trapezoid(y, x=x, initial=0)
+    assert res.shape == y.shape
+    assert np.allclose(res, [x ** 2 / 2, x ** 2])
+    assert np.allclose(_quadrature.cumulative_trapezoid(y, dx=0.01), res[:, 1:])
+
+
+@pytest.mark.parametrize("n", [3, 4, 11, 12])
+def test_cumulative_simpson(n):
+    x = np.linspace(0, 2, n)
+    res = _quadrature.cumulative_simpson(np.vstack((x ** 2, 3 * x ** 2)), x[1], 1.0)
+    assert np.allclose(res, [1 + x ** 3 / 3, 1 + x ** 3])
@@ -1,4 +1,6 @@
 import numpy as np
+import os
+from hmf.density_field import transfer_models as tm
 from hmf.density_field.transfer import Transfer
 from hmf.density_field.transfer_models import EH_BAO
 import pytest
@@ -94,3 +96,286 @@ def test_setting_kmax():
     camb_transfers = camb.get_transfer_functions(t.transfer.params["camb_params"])
     T = camb_transfers.get_matter_transfer_data().transfer_data
     assert np.max(T[0]) < 2.0
+
+
+def test_nonlinear_power_fn():
+    t = Transfer(transfer_model="EH", nonlinear_zmax=2.0, nonlinear_dz=0.1)
+    fn = t.nonlinear_power_fn
+
+    k = t.k[(t.k > 1e-3) & (t.k < 1e2)]
+    for z in [0.0, 0.55, 2.0]:
+        t.update(z=z)
+        assert t.nonlinear_power_fn is fn
+        assert np.allclose(
+            fn(k, z), t.nonlinear_power[(t.k > 1e-3) & (t.k < 1e2)], rtol=1e-4
+        )
+
+    assert fn(k[None], np.array([0.1, 0.2])[:, None]).shape == (2, len(k))
+
+    with pytest.raises(ValueError):
+        fn(k, 4.0)
+
+
+def test_bad_nonlinear_z_grid():
+    with pytest.raises(AssertionError):
+        Transfer(transfer_model="EH", nonlinear_zmax=0.1, nonlinear_dz=0.05)
+
+    # Three steps, up to round-off.
+    Transfer(
+        transfer_model="EH", nonlinear_zmin=0, nonlinear_zmax=0.3, nonlinear_dz=0.1
+    )
+
+
+def test_nonlinear_power_fn_reaches_zmax():
+    t = Transfer(transfer_model="EH", nonlinear_zmax=5.0, nonlinear_dz=0.4)
+    k = t.k[(t.k > 1e-3) & (t.k < 1e2)]
+    t.update(z=5.0)
+    assert np.allclose(
+        t.nonlinear_power_fn(k, 5.0),
+        t.nonlinear_power[(t.k > 1e-3) & (t.k < 1e2)],
+        rtol=1e-4,
+    )
+
+
+def test_growth_rate():
+    t = Transfer(transfer_model="EH", z=1.0)
+    assert np.isclose(t.growth_rate, t.growth.growth_rate(1.0))
+    t.update(use_splined_growth=True)
+    assert np.isclose(t.growth_rate, t.growth.growth_rate(1.0), rtol=1e-4)
+
+
+def test_camb_results_shared():
+    from hmf.cosmology import _camb
+
+    t = Transfer(transfer_model="CAMB", growth_model="CambGrowth", z=1.0)
+    results = _camb.get_results(t.transfer.params["camb_params"])
+    assert t.growth._camb_transfers is results
+
+    # A new instance with identical parameters re-uses the run.
+    t2 = Transfer(transfer_model="CAMB", z=2.0)
+    assert _camb.get_results(t2.transfer.params["camb_params"]) is results
+    assert np.allclose(t.transfer_function, t2.transfer_function)
+
+
+def test_camb_growth_cache_dir_kept(tmp_path):
+    t = Transfer(
+        transfer_model="CAMB",
+        growth_model="CambGrowth",
+        growth_params={"cache_dir": str(tmp_path)},
+    )
+    assert t.growth.params["cache_dir"] == str(tmp_path)
+    assert t.growth.params["camb_params"] is t.transfer.params["camb_params"]
+
+
+def test_fromfile_formats(tmp_path):
+    k = np.logspace(-4, 2, 100)
+    T = 1 / (1 + (k / 0.1) ** 2)
+    camb_table = np.ones((len(k), 7))
+    camb_table[:, 0] = k
+    camb_table[:, 6] = T
+
+    np.savetxt(tmp_path / "two.dat", np.array([k, T]).T)
+    np.savetxt(tmp_path / "camb.dat", camb_table)
+    np.save(tmp_path / "camb.npy", camb_table)
+    np.savez(tmp_path / "arrays.npz", k=k, T=T)
+
+    lnk = np.log(k[1:-2])
+    for fname in ["two.dat", "camb.dat", "camb.npy", "arrays.npz"]:
+        t = tm.FromFile(None, fname=str(tmp_path / fname))
+        assert np.allclose(t.lnt(lnk), np.log(T[1:-2]))
+
+
+def test_fromfile_parsed_once(tmp_path, monkeypatch):
+    k = np.logspace(-4, 2, 100)
+    fname = tmp_path / "transfer.dat"
+    np.savetxt(fname, np.array([k, 1 / (1 + k)]).T)
+
+    calls = []
+    read = tm._read_transfer_file
+    monkeypatch.setattr(
+        tm, "_read_transfer_file", lambda f: calls.append(f) or read(f)
+    )
+
+    lnk = np.log(k[1:-2])
+    tm.FromFile(None, fname=str(fname)).lnt(lnk)
+    tm.FromFile(None, fname=str(fname)).lnt(lnk)
+    assert len(calls) == 1
+
+    # Modifying the file re-reads it.
+    np.savetxt(fname, np.array([k, 2 / (1 + k)]).T)
+    os.utime(fname, ns=(0, 0))
+    assert np.allclose(
+        tm.FromFile(None, fname=str(fname)).lnt(lnk), np.log(2 / (1 + k[1:-2]))
+    )
+    assert len(calls) == 2
+
+
+def test_fromarray_interpolant_reused():
+    k = np.logspace(-4, 2, 100)
+    T = 1 / (1 + (k / 0.1) ** 2)
+    t = tm.FromArray(None, k=k, T=T)
+
+    lnk = np.log(np.logspace(-8, 1, 50))
+    lnt = t.lnt(lnk)
+    interpolant = t._lnt_spline
+    assert np.allclose(t.lnt(lnk), lnt)
+    assert t._lnt_spline is interpolant
+
+    # Constant below the table
+    assert np.allclose(lnt[lnk < np.log(k[0])], np.log(T[0]))
+
+
+def test_camb_eh_interpolant_reused():
+    from astropy.cosmology import Planck15
+
+    t = tm.CAMB(Planck15, extrapolate_with_eh=True, kmax=1.0)
+    lnk = np.linspace(-10, 5, 200)
+    lnt = t.lnt(lnk)
+    interpolant = t._lnt_spline
+    assert np.allclose(t.lnt(lnk), lnt)
+    assert t._lnt_spline is interpolant
+
+    # Above the table, the transfer follows EH (normalised to CAMB).
+    high = lnk > t._lnkmax
+    assert np.allclose(lnt[high], t._eh.lnt(lnk[high]) - t._eh_norm)
+
+
+def test_check_low_k_removes_turnup():
+    lnk = np.linspace(-10, 0, 11)
+    lnT = np.array([0.5, 0.2, 0, 0, 0, -0.1, -0.3, -0.6, -1, -1.5, -2.1])
+    lnkout, lnTout = tm.FromFile._check_low_k(lnk, lnT)
+    assert lnkout[0] == -8
+    assert np.all(lnTout[:3] == 0)
+
+
+@pytest.mark.parametrize("model", [tm.EH_BAO, tm.EH_NoBAO, tm.BBKS, tm.BondEfs])
+def test_lnt_batch(model):
+    from astropy.cosmology import FlatLambdaCDM
+
+    lnk = np.linspace(-8, 3, 50)
+    Om0 = np.array([0.25, 0.3, 0.35])
+    Ob0 = np.array([0.04, 0.05, 0.045])
+    h = np.array([0.65, 0.7, 0.75])
+
+    batch = model.lnt_batch(lnk, Om0, Ob0, h, Tcmb0=2.7255)
+    assert batch.shape == (3, 50)
+
+    for i in range(3):
+        cosmo = FlatLambdaCDM(H0=100 * h[i], Om0=Om0[i], Ob0=Ob0[i], Tcmb0=2.7255)
+        assert np.allclose(batch[i], model(cosmo=cosmo).lnt(lnk), rtol=1e-12)
+
+
+def test_lnt_batch_bad_params():
+    with pytest.raises(ValueError):
+        tm.BBKS.lnt_batch(np.zeros(3), 0.3, 0.05, 0.7, not_a_param=1)
+
+    with pytest.raises(NotImplementedError):
+        tm.FromArray.lnt_batch(np.zeros(3), 0.3, 0.05, 0.7)
+
+
+def test_emulator(tmp_path):
+    from astropy.cosmology import Planck15
+
+    fname = str(tmp_path / "emulator.npz")
+    tm.build_emulator(fname, {"Om0": (0.29, 0.32)}, n=2, kmax=5)
+
+    lnk = np.linspace(-8, 3, 100)
+    for Om0 in (0.29, 0.305):
+        cosmo = Planck15.clone(Om0=Om0)
+        emulated = tm.Emulator(cosmo, fname=fname).lnt(lnk)
+        assert np.allclose(emulated, tm.CAMB(cosmo, kmax=5).lnt(lnk), atol=1e-2)
+
+    with pytest.raises(ValueError):
+        tm.Emulator(Planck15.clone(Om0=0.35), fname=fname).lnt(lnk)
+
+    t = Transfer(transfer_model="Emulator", transfer_params={"fname": fname})
+    assert np.all(np.isfinite(t.power))
+
+
+def test_transfer_evaluated_once(monkeypatch):
+    calls = []
+    lnt = tm.EH_BAO.lnt
+
+    def counting_lnt(self, lnk):
+        calls.append(len(lnk))
+        return lnt(self, lnk)
+
+    monkeypatch.setattr(tm.EH_BAO, "lnt", counting_lnt)
+
+    t = Transfer(transfer_model="EH", lnk_min=-5, lnk_max=2)
+    assert np.allclose(t.k, np.exp(np.arange(-5, 2, t.dlnk)))
+    t.power
+
+    assert len(calls) == 1
+    assert calls[0] > len(t.k)
+
+    # The normalisation grid spans the sigma_8 range with the same spacing as k.
+    lnk, main, sig8 = t._lnk_grid
+    assert lnk[sig8][0] <= -8 < lnk[sig8][1]
+    assert np.allclose(np.diff(lnk), t.dlnk)
+    assert np.all(t._unnormalised_lnT == t._lnT_grid[main])
+
+
+def test_sig8_weights_independent_of_n():
+    from hmf.density_field.filters import TopHat
+
+    t = Transfer(transfer_model="EH")
+    weights = t._sig8_weights
+
+    t.update(n=0.9, sigma_8=0.7)
+    assert t._sig8_weights is weights
+
+    sigma = TopHat(t.k, t._unnormalised_power).sigma(8.0)[0]
+    assert np.isclose(t._unn_sig8, sigma, rtol=1e-12)
+    assert np.isclose(TopHat(t.k, t.power).sigma(8.0)[0], 0.7, rtol=1e-10)
+
+
+def test_incremental_k_range(monkeypatch):
+    calls = []
+    lnt = tm.EH_BAO.lnt
+
+    def counting_lnt(self, lnk):
+        calls.append(len(lnk))
+        return lnt(self, lnk)
+
+    monkeypatch.setattr(tm.EH_BAO, "lnt", counting_lnt)
+
+    t = Transfer(transfer_model="EH", lnk_min=-18, lnk_max=9)
+    t.power
+    n = len(t.k)
+
+    # Extending the grid only evaluates the transfer on the new points.
+    t.update(lnk_max=11)
+    power = t.power
+    assert calls[1:] == [len(t.k) - n]
+
+    direct = Transfer(transfer_model="EH", lnk_min=-18, lnk_max=11)
+    assert len(direct.k) == len(t.k)
+    assert np.allclose(power, direct.power, rtol=1e-12)
+
+    # A new spacing can not be spliced.
+    t.update(dlnk=0.1)
+    t.power
+    assert calls[-1] == len(t.k)
+
+
+def test_power_grid():
+    t = Transfer(transfer_model="EH")
+    zs = [0, 0.5, 2.0]
+    grid = t.power_grid(zs)
+    assert grid.shape == (3, len(t.k))
+    assert t.power_grid(zs) is grid
+
+    for z, row in zip(zs, grid):
+        t.update(z=z)
+        assert np.allclose(row, t.power, rtol=1e-10)
+
+    t.update(sigma_8=0.7)
+    assert np.allclose(t.power_grid(zs), grid * (0.7 / 0.8159) ** 2, rtol=1e-10)
+
+    t.update(growth_model="GenMFGrowth")
+    new = t.power_grid(zs)
+    t.update(z=2.0)
+    # GenMFGrowth integrates up to the largest redshift, so is only accurate to ~1e-7.
+    assert np.allclose(new[2], t.power, rtol=1e-6)
+    assert not np.allclose(new[2], grid[2] * (0.7 / 0.8159) ** 2, rtol=1e-4)